@@ -4,32 +4,34 @@
 #   Imports
 # ----------------------------------------------------------------------
 import os
+import re
 import sys
 import subprocess
+import hashlib
+import pickle
+import itertools
+import json
+import time
+import argparse
+import asyncio
+import csv
+import inspect
+import tracemalloc
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 #set path to the folder of where i have open vsp SET TO YOUR OWN PATH
 vsp_main = r'C:\VSP39'
 vsp_engine = r'C:\VSP39\python\openvsp\openvsp'
-if os.path.exists(vsp_main):
-    os.add_dll_directory(vsp_main)
-    if vsp_engine not in sys.path:
-        sys.path.insert(0, vsp_engine)
-try:
-    import _vsp as vsp
-    vsp.VSPRenew()
-    print("Vsp works")
-
-except Exception as e:
-    print(f"VSP Error: {e}")
 
 # General Python Imports
 import numpy as np
 # Numpy is a commonly used mathematically computing package. It contains many frequently used
 # mathematical functions and is faster than native Python, especially when using vectorized
 # quantities.
-import matplotlib.pyplot as plt
-# Matplotlib's pyplot can be used to generate a large variety of plots. Here it is used to create
-# visualizations of the aircraft's performance throughout the mission.
+# Matplotlib's pyplot is used to create visualizations of the aircraft's performance throughout the
+# mission. It, OpenVSP and the SUAVE plotting modules are only imported when they are used, so a
+# headless run never pays for them.
 
 # SUAVE Imports
 import SUAVE
@@ -37,41 +39,80 @@ assert SUAVE.__version__=='2.5.2', 'These tutorials only work with the SUAVE 2.5
 from SUAVE.Core import Data, Units 
 from SUAVE.Methods.Propulsion import propeller_design
 from SUAVE.Methods.Geometry.Two_Dimensional.Planform import segment_properties
-from SUAVE.Plots.Performance import *
-
-from SUAVE.Input_Output.OpenVSP import write, get_vsp_measurements
-from SUAVE.Input_Output.OpenVSP.vsp_read import vsp_read
 
 #from SUAVE.Methods.Geometry.Two_Dimensional.Planform import process_main_wing_geometry as process_wing
 
-from SUAVE.Plots.Geometry import plot_vehicle
-
 from copy import deepcopy
+from scipy.linalg import block_diag
+from scipy.interpolate import RegularGridInterpolator
+from collections import OrderedDict
+from scipy.optimize import fsolve
 
 output_name = "piper cherokee 180 .vsp3" #name of file in openvsp
 plane_name = 'Piper Cherokee 180 '
+cache_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache') #designed props etc. get stored here
+comp_geom_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), plane_name + '_CompGeom.csv') #OpenVSP CompGeom areas and volumes
+poh_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'POH') #values transcribed from Piper_PA-28-180E.pdf
 
-def main():
-    
-    vehicle = vehicle_setup()
-    
-    vsp_write_read(vehicle)
-    
-    plot_vehicle(vehicle)
-    
-    # Setup analyses and mission
-    analyses = base_analysis(vehicle)
-    analyses.finalize()
-    mission  = mission_setup(analyses,vehicle)
-    
-    # evaluate
-    results = mission.evaluate()
-    
-    plot_mission(results)
+def main(headless=False,results_path=None,trace_path=None,tolerance=None,flight_plan=False,plots_path=None,
+         polar_tables=False,aero_surrogate=False):
+    
+    vehicle = vehicle_setup(polar_tables=polar_tables)
+    
+    # headless runs skip geometry export and every plot
+    if not headless:
+        vsp_write_read(vehicle)
+        
+        from SUAVE.Plots.Geometry import plot_vehicle
+        plot_vehicle(vehicle)
+    
+    # the adaptive control points are worked out for the single cruise only
+    if flight_plan and tolerance is not None:
+        raise ValueError('a tolerance picks the control points of the cruise alone, it can not be used with the flight plan')
+    
+    # optionally record what the solver does at every iteration
+    tracer = None if trace_path is None else Solver_Tracer()
+    
+    # Setup analyses and mission, either the cruise alone or the whole climb, cruise and descent
+    if flight_plan:
+        analyses = flight_plan_analysis(vehicle, aero_surrogate)
+        mission  = mission_from_specs(analyses, vehicle, default_flight_plan)
+    else:
+        analyses = base_analysis(vehicle, aero_surrogate)
+        analyses.finalize()
+        report_aero_surrogate(analyses)
+        mission  = mission_setup(analyses,vehicle)
+    
+    # evaluate, letting the tolerance pick the control points when there is one
+    if tolerance is None:
+        if tracer is not None:
+            tracer.attach(mission)
+        results = mission.evaluate()
+        label   = mission.tag
+    else:
+        adaptive = adaptive_cruise(analyses, vehicle, tolerance, tracer=tracer)
+        results  = adaptive.results
+        label    = 'cruise, ' + str(adaptive.number_control_points) + ' control points'
+    
+    if tracer is not None:
+        tracer.print_summary()
+        tracer.save(trace_path)
+    
+    # keep the numbers, not just the plots
+    if results_path is not None:
+        export_results(results, results_path)
+    
+    # plots straight to files never wait on a window
+    if plots_path is not None:
+        plotter = Mission_Plotter(plots_path)
+        plotter.add_results(results, label)
+        plotter.save()
+    elif not headless:
+        plot_mission(results)
     
     return
 
-def vehicle_setup():
+def vehicle_setup(polar_tables=False,comp_geom=False):
     
     vehicle                                     = SUAVE.Vehicle() #repeatable
     vehicle.tag                                 = plane_name #repeatable
@@ -337,6 +378,28 @@ def vehicle_setup():
     net.engines.append(engine)
     
     #making the prop
+    prop                                        = prop_setup(engine)
+    
+    # 4. Now run the design, or load it from the cache if nothing changed
+    prop = cached_propeller_design(prop)
+    
+    # 5. Optionally let the BEMT use the tabulated polars instead of the spline surrogates
+    if polar_tables:
+        install_polar_tables(prop)
+    
+    net.propellers.append(prop)
+    
+    vehicle.append_component(net)
+    
+    # 6. Optionally take the wetted areas from the last OpenVSP CompGeom run
+    if comp_geom:
+        apply_comp_geom(vehicle, read_comp_geom())
+    
+    return vehicle
+
+def prop_setup(engine):
+    
+    #the prop inputs before propeller_design() fills in the blade, sweeps start from here too
     prop                                        = SUAVE.Components.Energy.Converters.Propeller()
     prop.number_of_blades                       = 2
     prop.origin                                 = [[5  * Units.inches, 0, 0]]
@@ -360,17 +423,9 @@ def vehicle_setup():
         './Airfoils/Polars/NACA_4412_polar_Re_1000000.txt' ]]
     
     # 3. Ensure the station indices are a standard list of 20 zeros
-    prop.airfoil_polar_stations = [0] * 20 
-    
-    # 4. Now run the design
-    prop = propeller_design(prop)
+    prop.airfoil_polar_stations = [0] * 20
     
-    
-    net.propellers.append(prop)
-    
-    vehicle.append_component(net)
-    
-    return vehicle
+    return prop
 
 def configs_setup(vehicle): #repeatable
      # ------------------------------------------------------------------
@@ -394,7 +449,8 @@ def configs_setup(vehicle): #repeatable
 #   Define the Mission
 # ----------------------------------------------------------------------
 
-def mission_setup(analyses,vehicle): #repeatable
+def mission_setup(analyses,vehicle,altitude=9000. * Units.feet,air_speed=116. * Units.knots,
+                  distance=100 * Units.nautical_mile,rpm=2600,number_control_points=16): #repeatable
 
     # ------------------------------------------------------------------
     #   Initialize the Mission
@@ -421,14 +477,14 @@ def mission_setup(analyses,vehicle): #repeatable
 
     segment.analyses.extend( analyses )
 
-    segment.altitude  = 9000. * Units.feet
-    segment.air_speed = 116.   * Units.knots
-    segment.distance  = 100 * Units.nautical_mile
+    segment.altitude  = altitude
+    segment.air_speed = air_speed
+    segment.distance  = distance
     
     ones_row                                        = segment.state.ones_row   
-    segment.state.numerics.number_control_points    = 16
+    segment.state.numerics.number_control_points    = number_control_points
     segment.state.unknowns.throttle                 = 1.0 * ones_row(1)
-    segment = vehicle.networks.internal_combustion.add_unknowns_and_residuals_to_segment(segment,rpm=2600)
+    segment = vehicle.networks.internal_combustion.add_unknowns_and_residuals_to_segment(segment,rpm=rpm)
     
     
     segment.process.iterate.conditions.stability    = SUAVE.Methods.skip
@@ -441,7 +497,7 @@ def mission_setup(analyses,vehicle): #repeatable
     return mission
 
 
-def base_analysis(vehicle): #repeatable
+def base_analysis(vehicle,aero_surrogate=False): #repeatable
 
     # ------------------------------------------------------------------
     #   Initialize analying
@@ -464,28 +520,15 @@ def base_analysis(vehicle): #repeatable
     #  Aerodynamics Analysis
     
     # Calculate extra drag from landing gear:
-    
-    main_wheel_width  = 4. * Units.inches
-    main_wheel_height = 12. * Units.inches
-    nose_gear_height  = 10. * Units.inches
-    nose_gear_width   = 4. * Units.inches
-    
-    total_wheel       = 2*main_wheel_width*main_wheel_height + nose_gear_width*nose_gear_height
-    
-    main_gear_strut_height = 2. * Units.inches
-    main_gear_strut_length = 24. * Units.inches
-    nose_gear_strut_height = 12. * Units.inches
-    nose_gear_strut_width  = 2. * Units.inches
-    
-    total_strut = 2*main_gear_strut_height*main_gear_strut_length + nose_gear_strut_height*nose_gear_strut_width
-    
-    # total drag increment area
-    drag_area = 1.4*( total_wheel + total_strut)
-    
+    drag_area = landing_gear_drag_area()
     
     aerodynamics = SUAVE.Analyses.Aerodynamics.Fidelity_Zero() 
     aerodynamics.geometry                            = vehicle
     aerodynamics.settings.drag_coefficient_increment = 1.0*drag_area/vehicle.reference_area
+    
+    # optionally serve the cruise envelope from a table built off Fidelity_Zero
+    if aero_surrogate:
+        aerodynamics = aerodynamics_surrogate(aerodynamics)
     analyses.append(aerodynamics)
 
     # ------------------------------------------------------------------
@@ -508,6 +551,30 @@ def base_analysis(vehicle): #repeatable
     # done!
     return analyses
 
+# the wheels and struts are bluff bodies, their frontal area is scaled up by this to get a drag area
+landing_gear_drag_factor = 1.4
+
+def landing_gear_drag_area(drag_factor=landing_gear_drag_factor):
+    
+    main_wheel_width  = 4. * Units.inches
+    main_wheel_height = 12. * Units.inches
+    nose_gear_height  = 10. * Units.inches
+    nose_gear_width   = 4. * Units.inches
+    
+    total_wheel       = 2*main_wheel_width*main_wheel_height + nose_gear_width*nose_gear_height
+    
+    main_gear_strut_height = 2. * Units.inches
+    main_gear_strut_length = 24. * Units.inches
+    nose_gear_strut_height = 12. * Units.inches
+    nose_gear_strut_width  = 2. * Units.inches
+    
+    total_strut = 2*main_gear_strut_height*main_gear_strut_length + nose_gear_strut_height*nose_gear_strut_width
+    
+    # total drag increment area
+    drag_area = drag_factor*( total_wheel + total_strut)
+    
+    return drag_area
+
 
 
 # ----------------------------------------------------------------------
@@ -516,6 +583,9 @@ def base_analysis(vehicle): #repeatable
 
 def plot_mission(results,line_style='bo-'):
     
+    from SUAVE.Plots.Performance import plot_flight_conditions, plot_aerodynamic_forces, plot_aerodynamic_coefficients, \
+         plot_drag_components, plot_altitude_sfc_weight, plot_aircraft_velocities
+    
     # Plot Flight Conditions 
     plot_flight_conditions(results, line_style)
     
@@ -537,17 +607,2897 @@ def plot_mission(results,line_style='bo-'):
     return
 
 
-def vsp_write_read(vehicle):
+def load_vsp():
+    
+    if os.path.exists(vsp_main):
+        os.add_dll_directory(vsp_main)
+        if vsp_engine not in sys.path:
+            sys.path.insert(0, vsp_engine)
+    try:
+        import _vsp as vsp
+        vsp.VSPRenew()
+        print("Vsp works")
+    
+    except Exception as e:
+        print(f"VSP Error: {e}")
+        vsp = None
+    
+    return vsp
+
+def vsp_write_read(vehicle, force=False):
+    
+    #the hash of what was last written sits next to the .vsp3, same geometry means nothing to do
+    vsp3_path = plane_name + '.vsp3'
+    hash_path = vsp3_path + '.sha256'
+    key       = geometry_hash(vehicle)
+    if not force and os.path.exists(vsp3_path) and os.path.exists(hash_path):
+        with open(hash_path) as f:
+            if f.read().strip() == key:
+                print('Geometry unchanged, keeping ' + vsp3_path)
+                return
+    
+    load_vsp()
+    from SUAVE.Input_Output.OpenVSP import write
     
     #save this vehicle
     write(vehicle, plane_name)
     
+    with open(hash_path, 'w') as f:
+        f.write(key)
+    
+    return
+
+def hash_tree(h, value, seen=None):
+    
+    #walks Data, lists and arrays, anything that is not a number or text (surrogates, functions) is left out
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return h
+    
+    if isinstance(value, dict):
+        seen.add(id(value))
+        for key in sorted(value.keys(), key=str):
+            hash_update(h, str(key))
+            hash_tree(h, value[key], seen)
+    elif isinstance(value, (str, type(None))):
+        hash_update(h, value)
+    else:
+        try:
+            hash_update(h, value)
+        except (TypeError, ValueError):
+            if isinstance(value, (list, tuple)):
+                seen.add(id(value))
+                for item in value:
+                    hash_tree(h, item, seen)
+    
+    return h
+
+def geometry_hash(vehicle):
+    
+    #everything write() turns into OpenVSP geometry
+    h = hashlib.sha256()
+    hash_update(h, SUAVE.__version__)
+    hash_update(h, vehicle.tag)
+    for name in ('wings', 'fuselages', 'nacelles', 'networks'):
+        hash_update(h, name)
+        hash_tree(h, vehicle.get(name))
+    
+    return h.hexdigest()
+
+comp_geom_names = {'Theo_Area': 'theoretical_area', 'Wet_Area': 'wetted_area', 
+                   'Theo_Vol': 'theoretical_volume', 'Wet_Vol': 'wetted_volume'}
+
+def read_comp_geom(path=comp_geom_file):
+    
+    #the component table only, it ends at the Totals row and the per surface table after it is skipped
+    comp_geom = Data()
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = [comp_geom_names.get(name.strip(), name.strip()) for name in next(reader)]
+        for row in reader:
+            if not row or not row[0].strip() or row[0].strip() == 'Totals':
+                break
+            name   = row[0].strip()
+            values = Data(zip(header[1:], (float(value) for value in row[1:])))
+            
+            #a mirrored component comes in once per side, the two halves add up
+            if name in comp_geom:
+                for key in values.keys():
+                    comp_geom[name][key] += values[key]
+            else:
+                comp_geom[name] = values
+    
+    return comp_geom
+
+def apply_comp_geom(vehicle, comp_geom):
+    
+    #OpenVSP's wetted areas in place of the hand numbers, matched up by tag
+    for wing in vehicle.wings.values():
+        if wing.tag in comp_geom:
+            wing.areas.wetted = comp_geom[wing.tag].wetted_area
+    
+    for fuselage in vehicle.fuselages.values():
+        if fuselage.tag in comp_geom:
+            fuselage.areas.wetted = comp_geom[fuselage.tag].wetted_area
+    
+    return vehicle
+
+
+# ----------------------------------------------------------------------
+#   Propeller Design Cache
+# ----------------------------------------------------------------------
+
+# everything propeller_design() reads off the prop, if any of these change the design is redone
+prop_design_inputs = ['number_of_blades', 'tip_radius', 'hub_radius', 'freestream_velocity', 'angular_velocity',
+                      'design_Cl', 'design_power', 'design_thrust', 'design_altitude', 'variable_pitch',
+                      'origin', 'airfoil_polar_stations']
+
+def hash_update(h, value):
+    
+    #strings and None go in as text, everything else as float64 bytes so 2 and 2.0 hash the same
+    if isinstance(value, bytes):
+        tag, data = b'b', value
+    elif isinstance(value, str):
+        tag, data = b's', value.encode()
+    elif value is None:
+        tag, data = b'n', b''
+    else:
+        array     = np.ascontiguousarray(value, dtype=np.float64)
+        tag, data = b'f', str(array.shape).encode() + array.tobytes()
+    
+    #a type tag and the length go in first so ('ab', 'c') and ('a', 'bc') can't collide
+    h.update(tag + len(data).to_bytes(8, 'little'))
+    h.update(data)
+    
+    return h
+
+def prop_design_key(prop):
+    
+    h = hashlib.sha256()
+    hash_update(h, SUAVE.__version__)
+    
+    for name in prop_design_inputs:
+        hash_update(h, name)
+        hash_update(h, prop.get(name))
+    
+    #the airfoil and polar files go in by content, not by name
+    files = list(prop.airfoil_geometry) + [polar for polars in prop.airfoil_polars for polar in polars]
+    for file in files:
+        with open(file, 'rb') as f:
+            hash_update(h, f.read())
+    
+    return h.hexdigest()
+
+def cached_propeller_design(prop, folder=cache_folder):
+    
+    key  = prop_design_key(prop)
+    path = os.path.join(folder, 'propeller_' + key + '.pkl')
+    
+    #same inputs as a previous run, chord, twist, radius and surrogates are all in the pickle
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            #truncated by a killed run or written by another SUAVE, throw it away and redesign
+            print('Discarding unreadable propeller cache ' + path)
+            os.remove(path)
+    
+    prop = propeller_design(prop)
+    
+    #write to a temp file first so parallel runs never read half a pickle
+    os.makedirs(folder, exist_ok=True)
+    temp = path + '.' + str(os.getpid()) + '.tmp'
+    with open(temp, 'wb') as f:
+        pickle.dump(prop, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp, path)
+    
+    return prop
+
+
+# ----------------------------------------------------------------------
+#   Batch Cruise Missions
+# ----------------------------------------------------------------------
+
+# where the numbers we usually want live inside a segment's conditions
+cruise_channels = {
+    'time'             : 'frames.inertial.time',
+    'altitude'         : 'freestream.altitude',
+    'air_speed'        : 'freestream.velocity',
+    'throttle'         : 'propulsion.throttle',
+    'rpm'              : 'propulsion.rpm',
+    'power'            : 'propulsion.power',
+    'angle_of_attack'  : 'aerodynamics.angle_of_attack',
+    'lift_coefficient' : 'aerodynamics.lift_coefficient',
+    'drag_coefficient' : 'aerodynamics.drag_coefficient',
+    'mass'             : 'weights.total_mass',
+    'fuel_mass_rate'   : 'weights.vehicle_mass_rate',
+}
+
+def get_condition(conditions, path):
+    
+    for key in path.split('.'):
+        conditions = conditions[key]
+    
+    return conditions
+
+def batch_cruise_mission(analyses,vehicle,altitudes,air_speeds,distances,rpms,number_control_points=16):
+    
+    # every case gets its own block of control points in one big segment
+    altitudes, air_speeds, distances, rpms = np.broadcast_arrays(*[np.atleast_1d(np.asarray(v, dtype=float)) 
+                                                                   for v in (altitudes, air_speeds, distances, rpms)])
+    n_cases = altitudes.size
+    
+    mission = SUAVE.Analyses.Mission.Sequential_Segments()
+    mission.tag = 'the_batch_mission'
+    
+    Segments     = SUAVE.Analyses.Mission.Segments
+    base_segment = Segments.Segment()
+    
+    segment = Segments.Cruise.Constant_Speed_Constant_Altitude(base_segment)
+    segment.tag = "batch_cruise"
+    
+    segment.analyses.extend( analyses )
+    
+    #the real per case values are in segment.batch, these are just so the segment is complete
+    segment.altitude  = altitudes[0]
+    segment.air_speed = air_speeds[0]
+    segment.distance  = distances[0]
+    
+    segment.batch                                   = Data()
+    segment.batch.number_of_cases                   = n_cases
+    segment.batch.number_control_points             = number_control_points
+    segment.batch.altitude                          = altitudes
+    segment.batch.air_speed                         = air_speeds
+    segment.batch.distance                          = distances
+    segment.batch.rpm                               = rpms
+    segment.batch.max_iterations                    = 25
+    
+    ones_row                                        = segment.state.ones_row   
+    segment.state.numerics.number_control_points    = n_cases * number_control_points
+    segment.state.unknowns.throttle                 = 1.0 * ones_row(1)
+    segment = vehicle.networks.internal_combustion.add_unknowns_and_residuals_to_segment(segment,rpm=rpms[0])
+    
+    #swap in the steps that know about the case blocks
+    segment.process.initialize.differentials        = initialize_batch_differentials
+    segment.process.initialize.conditions           = initialize_batch_conditions
+    segment.process.iterate.conditions.differentials = update_batch_differentials_time
+    segment.settings.root_finder                    = batch_root_finder
+    
+    segment.process.iterate.conditions.stability    = SUAVE.Methods.skip
+    segment.process.finalize.post_process.stability = SUAVE.Methods.skip    
+    
+    mission.append_segment(segment)
+    
+    return mission
+
+def initialize_batch_differentials(segment):
+    
+    numerics = segment.state.numerics
+    n_cases  = segment.batch.number_of_cases
+    
+    # one chebyshev grid per case, the operators are block diagonal so cases never mix
+    x,D,I = numerics.discretization_method(segment.batch.number_control_points,**numerics)
+    
+    numerics.dimensionless.control_points = np.tile(x,(n_cases,1))
+    numerics.dimensionless.differentiate  = block_diag(*[D]*n_cases)
+    numerics.dimensionless.integrate      = block_diag(*[I]*n_cases)
+    
+    return
+
+def initialize_batch_conditions(segment):
+    
+    batch      = segment.batch
+    n_cp       = batch.number_control_points
+    conditions = segment.state.conditions
+    
+    alt        = np.repeat(batch.altitude, n_cp)
+    air_speed  = np.repeat(batch.air_speed, n_cp)
+    t_final    = np.repeat(batch.distance / batch.air_speed, n_cp)
+    t_nondim   = segment.state.numerics.dimensionless.control_points[:,0]
+    
+    conditions.freestream.altitude[:,0]             = alt
+    conditions.frames.inertial.position_vector[:,2] = -alt
+    conditions.frames.inertial.velocity_vector[:,0] = air_speed
+    conditions.frames.inertial.time[:,0]            = t_nondim * t_final
+    
+    #each case starts from its own rpm guess
+    segment.state.unknowns.rpm[:,0]                 = np.repeat(batch.rpm, n_cp)
+    
+    return
+
+def update_batch_differentials_time(segment):
+    
+    numerics = segment.state.numerics
+    n_cp     = segment.batch.number_control_points
+    
+    x = numerics.dimensionless.control_points
+    D = numerics.dimensionless.differentiate
+    I = numerics.dimensionless.integrate
+    t = segment.state.conditions.frames.inertial.time[:,0]
+    
+    # scale every block by its own case duration
+    t0 = np.repeat(t[0::n_cp], n_cp)[:,None]
+    dt = np.repeat(t[n_cp-1::n_cp] - t[0::n_cp], n_cp)[:,None]
+    
+    numerics.time.control_points = t0 + x * dt
+    numerics.time.differentiate  = D / dt
+    numerics.time.integrate      = I * dt
+    
+    segment.state.conditions.frames.inertial.time[:,0] = numerics.time.control_points[:,0]
+    
+    return
+
+def batch_root_finder(fun, x0, args=(), xtol=1e-8, maxfev=0, epsfcn=None, full_output=0, **kwargs):
+    
+    # drop in for scipy's fsolve, but newton with a block jacobian since the cases are independent
+    if not isinstance(args, tuple):
+        args = (args,)
+    segment = args[0]
+    n_cases = segment.batch.number_of_cases
+    n_cp    = segment.batch.number_control_points
+    eps     = np.sqrt(epsfcn) if epsfcn else np.sqrt(np.finfo(float).eps)
+    
+    x = np.array(x0, dtype=float)
+    f = fun(x, *args)
+    nfev = 1
+    
+    # unknowns and residuals are packed column by column, this pulls out each case's entries
+    n_cols = x.size // (n_cases * n_cp)
+    index  = np.arange(x.size).reshape(n_cols, n_cases, n_cp).transpose(1,0,2).reshape(n_cases, -1)
+    m      = index.shape[1]
+    
+    converged = np.zeros(n_cases, dtype=bool)
+    for iteration in range(segment.batch.max_iterations):
+        
+        F = f[index]
+        J = np.empty((n_cases, m, m))
+        
+        # one perturbation of the same local unknown in every case fills a column of every case's jacobian
+        for j in range(m):
+            cols     = index[:,j]
+            h        = eps * np.maximum(np.abs(x[cols]), 1.)
+            x_step   = x.copy()
+            x_step[cols] += h
+            J[:,:,j] = (fun(x_step, *args)[index] - F) / h[:,None]
+            nfev    += 1
+        
+        try:
+            dx = np.linalg.solve(J, -F[...,None])[...,0]
+        except np.linalg.LinAlgError:
+            dx = np.array([np.linalg.lstsq(J[k], -F[k], rcond=None)[0] for k in range(n_cases)])
+        
+        dx[converged] = 0.
+        x[index]     += dx
+        f             = fun(x, *args)
+        nfev         += 1
+        
+        converged = converged | (np.linalg.norm(dx, axis=1) <= xtol * np.maximum(np.linalg.norm(x[index], axis=1), 1.))
+        if np.all(converged) or (maxfev and nfev >= maxfev):
+            break
+    
+    segment.batch.converged = converged
+    
+    if np.all(converged):
+        ier, msg = 1, 'The solution converged.'
+    else:
+        ier, msg = 5, str(np.sum(~converged)) + ' of ' + str(n_cases) + ' batch cases did not converge.'
+    
+    if full_output:
+        return x, {'nfev': nfev, 'fvec': f}, ier, msg
+    
+    return x
+
+def evaluate_cruise_batch(analyses,vehicle,altitudes,air_speeds,distances,rpms,number_control_points=16,cases_per_batch=128):
+    
+    altitudes, air_speeds, distances, rpms = np.broadcast_arrays(*[np.atleast_1d(np.asarray(v, dtype=float)) 
+                                                                   for v in (altitudes, air_speeds, distances, rpms)])
+    n_cases = altitudes.size
+    
+    # the block operators grow with the square of the points, so go through in chunks
+    chunks = []
+    for start in range(0, n_cases, cases_per_batch):
+        cases   = slice(start, start + cases_per_batch)
+        mission = batch_cruise_mission(analyses, vehicle, altitudes[cases], air_speeds[cases], distances[cases], 
+                                       rpms[cases], number_control_points)
+        results = mission.evaluate()
+        chunks.append(unstack_cruise_batch(results.segments.batch_cruise))
+    
+    batch = Data()
+    for key in chunks[0].keys():
+        batch[key] = np.concatenate([chunk[key] for chunk in chunks])
+    
+    return batch
+
+def unstack_cruise_batch(segment):
+    
+    n_cases    = segment.batch.number_of_cases
+    n_cp       = segment.batch.number_control_points
+    conditions = segment.state.conditions
+    
+    # every channel comes back as (case, control point)
+    batch = Data()
+    for name, path in cruise_channels.items():
+        batch[name] = get_condition(conditions, path)[:,0].reshape(n_cases, n_cp)
+    
+    batch.fuel_burn   = batch.mass[:,0] - batch.mass[:,-1]
+    batch.flight_time = batch.time[:,-1] - batch.time[:,0]
+    batch.converged   = segment.batch.converged
+    
+    return batch
+
+
+# ----------------------------------------------------------------------
+#   Parameter Sweeps
+# ----------------------------------------------------------------------
+
+# each worker process builds the vehicle and analyses once and keeps them here
+sweep_worker = Data()
+
+# prop inputs that need a new propeller_design(), engine power is in here since design_power follows it
+prop_sweep_parameters = ['design_Cl', 'sea_level_power', 'design_power_fraction', 'tip_radius', 'angular_velocity']
+
+class Column_Store:
+    
+    # rows of scalars come in one at a time, columns come out as arrays
+    def __init__(self):
+        self.columns = {}
+        self.rows    = 0
+    
+    def append(self, row):
+        for key in row.keys() - self.columns.keys():
+            self.columns[key] = [np.nan] * self.rows
+        for key, column in self.columns.items():
+            column.append(row.get(key, np.nan))
+        self.rows += 1
+    
+    def arrays(self):
+        return {key: np.asarray(column) for key, column in self.columns.items()}
+    
+    def save(self, path, format=None):
+        write_columns(path, self.arrays(), format)
+
+def cherokee_engine(vehicle):
+    return list(vehicle.networks.internal_combustion.engines.values())[0]
+
+def cherokee_propeller(vehicle):
+    return list(vehicle.networks.internal_combustion.propellers.values())[0]
+
+def get_sweep_parameters(vehicle, analyses):
+    
+    parameters                               = Data()
+    parameters.takeoff_weight                = vehicle.mass_properties.takeoff
+    parameters.drag_coefficient_increment    = analyses.aerodynamics.settings.drag_coefficient_increment
+    parameters.design_Cl                     = cherokee_propeller(vehicle).design_Cl
+    parameters.design_power_fraction         = cherokee_propeller(vehicle).design_power / cherokee_engine(vehicle).sea_level_power
+    parameters.tip_radius                    = cherokee_propeller(vehicle).tip_radius
+    parameters.angular_velocity              = cherokee_propeller(vehicle).angular_velocity
+    parameters.sea_level_power               = cherokee_engine(vehicle).sea_level_power
+    parameters.power_specific_fuel_consumption = cherokee_engine(vehicle).power_specific_fuel_consumption
+    parameters.gear_drag_factor              = landing_gear_drag_factor
+    parameters.fuselage_wetted_area          = vehicle.fuselages.fuselage.areas.wetted
+    
+    return parameters
+
+def apply_sweep_case(vehicle, analyses, case):
+    
+    # start every case from the baseline so nothing leaks over from the previous case
+    values = Data(sweep_worker.baseline)
+    for key, value in case.items():
+        if key not in values:
+            raise KeyError('unknown sweep parameter: ' + key)
+        values[key] = value
+    
+    vehicle.mass_properties.takeoff                           = values.takeoff_weight
+    vehicle.fuselages.fuselage.areas.wetted                   = values.fuselage_wetted_area
+    engine                                                    = cherokee_engine(vehicle)
+    engine.sea_level_power                                    = values.sea_level_power
+    engine.power_specific_fuel_consumption                    = values.power_specific_fuel_consumption
+    
+    # the increment is all landing gear, so the gear factor scales it
+    analyses.aerodynamics.settings.drag_coefficient_increment = values.drag_coefficient_increment * \
+        values.gear_drag_factor / landing_gear_drag_factor
+    
+    # only redesign the prop when one of its inputs moved, and even then it is usually in the cache
+    prop_values = tuple(values[key] for key in prop_sweep_parameters)
+    if prop_values != sweep_worker.prop_values:
+        prop                  = prop_setup(engine)
+        prop.design_Cl        = values.design_Cl
+        prop.design_power     = values.design_power_fraction * values.sea_level_power
+        prop.tip_radius       = values.tip_radius
+        prop.angular_velocity = values.angular_velocity
+        prop                  = cached_propeller_design(prop)
+        if sweep_worker.get('mode') == 'polar_tables':
+            install_polar_tables(prop, report=False)
+        vehicle.networks.internal_combustion.propellers[prop.tag] = prop
+        sweep_worker.prop_values = prop_values
+    
+    return
+
+def init_sweep_worker(snapshot_path=None, mode='direct'):
+    
+    # the snapshot only ever holds the direct model, the tabulated ones are built here
+    if mode in ('surrogate', 'polar_tables'):
+        vehicle  = vehicle_setup(polar_tables = mode == 'polar_tables')
+        analyses = base_analysis(vehicle, aero_surrogate = mode == 'surrogate')
+        analyses.finalize()
+    else:
+        vehicle, analyses = load_vehicle_and_analyses(snapshot_path)
+    
+    sweep_worker.mode        = mode
+    sweep_worker.vehicle     = vehicle
+    sweep_worker.analyses    = analyses
+    sweep_worker.baseline    = get_sweep_parameters(vehicle, analyses)
+    sweep_worker.prop_values = tuple(sweep_worker.baseline[key] for key in prop_sweep_parameters)
+    
+    return
+
+def mission_summary(results):
+    
+    segments   = list(results.segments.values())
+    channel    = lambda name: results_channel(results, name)
+    mass       = channel('mass')
+    time       = channel('time')
+    rpm        = channel('rpm')
+    
+    summary                = Data()
+    summary.fuel_burn      = mass[0] - mass[-1]
+    summary.final_mass     = mass[-1]
+    summary.flight_time    = time[-1] - time[0]
+    summary.mean_throttle  = np.mean(channel('throttle'))
+    summary.mean_rpm       = np.mean(rpm)
+    summary.max_rpm        = np.max(rpm)
+    summary.converged      = all(bool(segment.state.numerics.converged) for segment in segments)
+    
+    return summary
+
+def results_channel(results, name):
+    
+    # one channel straight through every segment, nothing else in the results is touched
+    return np.concatenate([get_condition(segment.state.conditions, cruise_channels[name])[:,0] 
+                           for segment in results.segments.values()])
+
+def run_sweep_case(index, case):
+    
+    try:
+        apply_sweep_case(sweep_worker.vehicle, sweep_worker.analyses, case)
+        mission = mission_setup(sweep_worker.analyses, sweep_worker.vehicle)
+        
+        # a sweep only ever reads the summary channels back
+        Results_Retention().attach(mission)
+        results = mission.evaluate()
+        summary = mission_summary(results)
+        summary.retained_bytes = retained_bytes(results)
+    except Exception as e:
+        print('Sweep case ' + str(index) + ' failed: ' + str(e))
+        summary = Data(converged = False)
+    
+    return index, case, summary
+
+def sweep_cases(parameter_grid):
+    
+    # a dict of lists is a full grid, a list of dicts is taken as is
+    if isinstance(parameter_grid, dict):
+        names = list(parameter_grid.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*parameter_grid.values())]
+    
+    return [dict(case) for case in parameter_grid]
+
+def run_sweep(parameter_grid, max_workers=None, store=None, snapshot_path=None):
+    
+    cases = sweep_cases(parameter_grid)
+    if store is None:
+        store = Column_Store()
+    
+    # build the snapshot once up here so the workers only ever load it
+    if snapshot_path is not None:
+        load_vehicle_and_analyses(snapshot_path)
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_sweep_worker, initargs=(snapshot_path,)) as executor:
+        futures = [executor.submit(run_sweep_case, index, case) for index, case in enumerate(cases)]
+        
+        # rows land in the store as soon as each case finishes
+        for future in as_completed(futures):
+            index, case, summary = future.result()
+            row = {'case': index}
+            row.update(case)
+            row.update(summary)
+            store.append(row)
+    
+    return store
+
+
+# ----------------------------------------------------------------------
+#   Columnar Results
+# ----------------------------------------------------------------------
+
+results_format_version = 1
+
+def results_format(path):
+    
+    # a .parquet name gets one parquet file, anything else a folder of .npy columns
+    return 'parquet' if str(path).endswith('.parquet') else 'npy'
+
+def import_parquet():
+    
+    # pyarrow is optional, only the parquet format needs it
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('parquet results need pyarrow (pip install pyarrow), or write to a folder of .npy columns instead')
+    
+    return pyarrow
+
+def flatten_conditions(conditions, n_points, prefix='', columns=None):
+    
+    # one column per condition path, wide arrays get a column per index
+    if columns is None:
+        columns = {}
+    
+    for key, value in conditions.items():
+        path = prefix + key
+        if isinstance(value, dict):
+            flatten_conditions(value, n_points, path + '.', columns)
+        elif isinstance(value, np.ndarray) and value.ndim == 2 and value.shape[0] == n_points:
+            if value.shape[1] == 1:
+                columns[path] = value[:,0]
+            else:
+                for i in range(value.shape[1]):
+                    columns[path + '.' + str(i)] = value[:,i]
+    
+    return columns
+
+def results_columns(results):
+    
+    segments = []
+    for segment in results.segments.values():
+        n_points = segment.state.numerics.number_control_points
+        segments.append((n_points, flatten_conditions(segment.state.conditions, n_points)))
+    
+    # segments are stacked end to end, a path missing from a segment is nan there
+    names   = sorted(set().union(*[columns.keys() for n_points, columns in segments]))
+    columns = {}
+    for name in names:
+        columns[name] = np.concatenate([np.asarray(columns_i.get(name, np.full(n_points, np.nan)), dtype=np.float64)
+                                        for n_points, columns_i in segments])
+    columns['segment'] = np.concatenate([np.full(n_points, i) for i, (n_points, columns_i) in enumerate(segments)])
+    
+    return columns
+
+def write_columns(path, columns, format=None):
+    
+    if format is None:
+        format = results_format(path)
+    
+    if format == 'npy':
+        # a folder of .npy files so every column can be memory mapped on its own
+        os.makedirs(path, exist_ok=True)
+        manifest = {'format_version': results_format_version, 'columns': {}}
+        for name, column in columns.items():
+            column = np.ascontiguousarray(column)
+            np.save(os.path.join(path, name + '.npy'), column)
+            manifest['columns'][name] = {'dtype': str(column.dtype), 'length': len(column)}
+        with open(os.path.join(path, 'columns.json'), 'w') as f:
+            json.dump(manifest, f, indent=1)
+    
+    elif format == 'parquet':
+        pyarrow = import_parquet()
+        table = pyarrow.table({name: np.ascontiguousarray(column) for name, column in columns.items()})
+        pyarrow.parquet.write_table(table, path)
+    
+    else:
+        raise ValueError('unknown results format: ' + str(format))
+    
+    return path
+
+def export_results(results, path, format=None):
+    return write_columns(path, results_columns(results), format)
+
+def list_results_columns(path):
+    
+    if os.path.isdir(path):
+        with open(os.path.join(path, 'columns.json')) as f:
+            return list(json.load(f)['columns'].keys())
+    
+    pyarrow = import_parquet()
+    return pyarrow.parquet.read_schema(path).names
+
+def load_results_column(path, column):
+    
+    # only the one column is touched, the npy folder gives back a memory map
+    if os.path.isdir(path):
+        return np.load(os.path.join(path, column + '.npy'), mmap_mode='r')
+    
+    pyarrow = import_parquet()
+    return pyarrow.parquet.read_table(path, columns=[column]).column(column).to_numpy()
+
+
+# ----------------------------------------------------------------------
+#   Airfoil Polar Tables
+# ----------------------------------------------------------------------
+
+polar_table_version = 2
+polar_alpha_step    = 0.25 * Units.deg #the spacing xfoil wrote the polars at
+
+def read_xfoil_polar(path):
+    
+    with open(path) as f:
+        lines = f.readlines()
+    
+    # header block first, the numbers start after the dashed line
+    reynolds = None
+    start    = None
+    for i, line in enumerate(lines):
+        match = re.search(r'Re\s*=\s*([\d.]+)\s*e\s*([-+]?\d+)', line)
+        if match:
+            reynolds = float(match.group(1)) * 10**int(match.group(2))
+        if line.strip().startswith('------'):
+            start = i + 1
+            break
+    if reynolds is None or start is None:
+        raise ValueError('not an xfoil polar: ' + path)
+    
+    #alpha, CL, CD, CDp, CM, Top_Xtr, Bot_Xtr
+    data = np.atleast_2d(np.loadtxt(lines[start:]))
+    
+    return reynolds, data
+
+class Airfoil_Polar:
+    
+    # cl, cd and cm on a (Re x alpha) grid, alpha uniform in radians so lookups need no search,
+    # alpha_limits is the (Re x 2) range each xfoil polar actually has data for
+    def __init__(self, reynolds, alpha, cl, cd, cm, alpha_limits):
+        self.reynolds     = np.asarray(reynolds, dtype=np.float64)
+        self.alpha        = np.asarray(alpha, dtype=np.float64)
+        self.cl           = np.asarray(cl, dtype=np.float64)
+        self.cd           = np.asarray(cd, dtype=np.float64)
+        self.cm           = np.asarray(cm, dtype=np.float64)
+        self.alpha_limits = np.asarray(alpha_limits, dtype=np.float64)
+    
+    def __call__(self, alpha, reynolds):
+        bracket = self.bracket(alpha, reynolds)
+        return self.lookup(self.cl, alpha, reynolds, bracket), self.lookup(self.cd, alpha, reynolds, bracket)
+    
+    def bracket(self, alpha, reynolds):
+        
+        alpha, reynolds = np.broadcast_arrays(np.asarray(alpha, dtype=np.float64), np.asarray(reynolds, dtype=np.float64))
+        
+        # the cells and weights in alpha and log(Re), both held at the ends of the table
+        a  = np.clip((alpha - self.alpha[0]) / (self.alpha[1] - self.alpha[0]), 0., len(self.alpha) - 1.)
+        i  = np.minimum(a.astype(np.intp), len(self.alpha) - 2)
+        ta = a - i
+        
+        log_re = np.log(self.reynolds)
+        r      = np.clip(np.log(np.maximum(reynolds, 1.)), log_re[0], log_re[-1])
+        j      = np.clip(np.searchsorted(log_re, r) - 1, 0, len(log_re) - 2)
+        tr     = (r - log_re[j]) / (log_re[j+1] - log_re[j])
+        
+        return i, ta, j, tr
+    
+    def lookup(self, table, alpha, reynolds, bracket=None):
+        
+        # bilinear, a bracket from the same alpha and Re can be passed in so it is only found once
+        i, ta, j, tr = self.bracket(alpha, reynolds) if bracket is None else bracket
+        
+        low    = (1. - ta) * table[j,i]   + ta * table[j,i+1]
+        high   = (1. - ta) * table[j+1,i] + ta * table[j+1,i+1]
+        
+        return (1. - tr) * low + tr * high
+    
+    def covered(self, alpha, reynolds, bracket=None):
+        
+        # inside the data of both polars the lookup blends, past stall or below it the table only holds flat
+        i, ta, j, tr    = self.bracket(alpha, reynolds) if bracket is None else bracket
+        alpha, reynolds = np.broadcast_arrays(np.asarray(alpha, dtype=np.float64), np.asarray(reynolds, dtype=np.float64))
+        lower  = np.maximum(self.alpha_limits[j,0], self.alpha_limits[j+1,0])
+        upper  = np.minimum(self.alpha_limits[j,1], self.alpha_limits[j+1,1])
+        
+        return (alpha >= lower) & (alpha <= upper)
+
+class Polar_Surrogate:
+    
+    # looks like the spline surrogates the propeller calls with (Re, alpha, grid=False),
+    # anything the xfoil data does not cover goes to the spline surrogate it replaced
+    def __init__(self, polar, coefficient, fallback):
+        self.polar       = polar
+        self.coefficient = coefficient
+        self.fallback    = fallback
+    
+    def __call__(self, reynolds, alpha, grid=False):
+        if grid:
+            reynolds, alpha = np.meshgrid(reynolds, alpha, indexing='ij')
+        reynolds, alpha = np.broadcast_arrays(np.asarray(reynolds, dtype=np.float64), np.asarray(alpha, dtype=np.float64))
+        
+        bracket = self.polar.bracket(alpha, reynolds)
+        values  = self.polar.lookup(getattr(self.polar, self.coefficient), alpha, reynolds, bracket)
+        outside = ~self.polar.covered(alpha, reynolds, bracket)
+        if np.any(outside):
+            values[outside] = self.fallback(reynolds[outside], alpha[outside], grid=False)
+        
+        return values
+
+def build_polar_table(files):
+    
+    polars   = sorted((read_xfoil_polar(file) for file in files), key=lambda polar: polar[0])
+    reynolds = np.array([polar[0] for polar in polars])
+    
+    # one alpha grid covering every file, each polar is held flat past its own ends
+    alpha_min = min(polar[1][:,0].min() for polar in polars) * Units.deg
+    alpha_max = max(polar[1][:,0].max() for polar in polars) * Units.deg
+    alpha     = alpha_min + polar_alpha_step * np.arange(int(round((alpha_max - alpha_min) / polar_alpha_step)) + 1)
+    
+    tables = []
+    for column in (1, 2, 4):
+        tables.append(np.array([np.interp(alpha, data[:,0] * Units.deg, data[:,column]) for re_i, data in polars]))
+    limits = np.array([[data[:,0].min(), data[:,0].max()] for re_i, data in polars]) * Units.deg
+    
+    return Airfoil_Polar(reynolds, alpha, *tables, limits)
+
+def load_polar_table(files, folder=cache_folder):
+    
+    h = hashlib.sha256()
+    hash_update(h, polar_table_version)
+    for file in files:
+        with open(file, 'rb') as f:
+            hash_update(h, f.read())
+    path = os.path.join(folder, 'polar_' + h.hexdigest() + '.npz')
+    
+    # parse the text files once, after that it is a straight binary load
+    if os.path.exists(path):
+        with np.load(path) as table:
+            return Airfoil_Polar(table['reynolds'], table['alpha'], table['cl'], table['cd'], table['cm'], 
+                                 table['alpha_limits'])
+    
+    polar = build_polar_table(files)
+    os.makedirs(folder, exist_ok=True)
+    temp = path + '.' + str(os.getpid()) + '.tmp.npz'
+    np.savez(temp, reynolds=polar.reynolds, alpha=polar.alpha, cl=polar.cl, cd=polar.cd, cm=polar.cm, 
+             alpha_limits=polar.alpha_limits)
+    os.replace(temp, path)
+    
+    return polar
+
+def install_polar_tables(prop, report=True):
+    
+    for geometry, files in zip(prop.airfoil_geometry, prop.airfoil_polars):
+        polar = load_polar_table(files)
+        prop.airfoil_cl_surrogates[geometry] = Polar_Surrogate(polar, 'cl', prop.airfoil_cl_surrogates[geometry])
+        prop.airfoil_cd_surrogates[geometry] = Polar_Surrogate(polar, 'cd', prop.airfoil_cd_surrogates[geometry])
+    
+    # how far the tables move the blade sections from the spline surrogates, before anything is flown on them
+    if report:
+        compare_polar_tables(prop)
+    
+    return prop
+
+def blade_section_grid(prop, alpha=np.linspace(-10., 30., 161) * Units.deg):
+    
+    # every blade station at its design point Reynolds number, across the whole alpha range a blade can see
+    atmosphere = SUAVE.Analyses.Atmospheric.US_Standard_1976().compute_values(prop.design_altitude)
+    radius     = np.asarray(prop.radius_distribution)
+    speed      = np.sqrt(prop.freestream_velocity**2 + (prop.angular_velocity * radius)**2)
+    reynolds   = atmosphere.density[0,0] * speed * np.asarray(prop.chord_distribution) / atmosphere.dynamic_viscosity[0,0]
+    
+    return np.meshgrid(reynolds, alpha, indexing='ij')
+
+def compare_polar_tables(prop, alpha=np.linspace(-10., 30., 161) * Units.deg):
+    
+    radius     = np.asarray(prop.radius_distribution)
+    re, a      = blade_section_grid(prop, alpha)
+    
+    comparison = Data()
+    for geometry in prop.airfoil_geometry:
+        for coefficient, surrogates in (('cl', prop.airfoil_cl_surrogates), ('cd', prop.airfoil_cd_surrogates)):
+            table = surrogates[geometry]
+            if not isinstance(table, Polar_Surrogate):
+                continue
+            difference = np.abs(table(re, a) - table.fallback(re, a, grid=False))
+            station, k = np.unravel_index(np.argmax(difference), difference.shape)
+            comparison[coefficient] = Data(max_difference = float(difference[station, k]), 
+                                           r_R            = float(radius[station] / prop.tip_radius),
+                                           alpha          = float(alpha[k]))
+            print('polar table %s: max |d%s| %.4f against the spline surrogate (r/R %.2f, alpha %.1f deg)' % (
+                  os.path.basename(geometry), coefficient, difference[station, k], radius[station] / prop.tip_radius, 
+                  alpha[k] / Units.deg))
+    
+    return comparison
+
+
+# ----------------------------------------------------------------------
+#   Aerodynamics Surrogate
+# ----------------------------------------------------------------------
+
+def set_condition(conditions, path, value):
+    
+    keys = path.split('.')
+    for key in keys[:-1]:
+        if key not in conditions:
+            conditions[key] = Data()
+        conditions = conditions[key]
+    conditions[keys[-1]] = value
+    
+    return
+
+class Aerodynamics_Surrogate(SUAVE.Analyses.Aerodynamics.Aerodynamics):
+    
+    def __defaults__(self):
+        
+        self.tag               = 'aerodynamics'
+        self.model             = None
+        
+        # the cruise envelope the table covers, queries outside it are extrapolated linearly
+        self.angle_of_attack   = np.linspace(-4., 12., 17) * Units.deg
+        self.mach              = np.linspace(0.05, 0.30, 11)
+        self.altitude          = np.linspace(0., 14000., 8) * Units.feet
+        
+        self.cache_size        = 256
+        self.validation_points = 64
+        self.columns           = []
+        self.interpolant       = None
+        self.built_increment   = 0.
+        self.built_inputs      = None
+        self.error_bound       = Data()
+        self.cache             = OrderedDict()
+    
+    def finalize(self):
+        
+        self.model.finalize()
+        self.build()
+        self.validate()
+        
+        return
+    
+    def inputs_hash(self):
+        
+        # everything the table was tabulated from except the gear increment, which evaluate() adds on flat
+        h = hash_airframe(hashlib.sha256(), self.geometry)
+        for key in sorted(self.settings.keys()):
+            if key != 'drag_coefficient_increment':
+                hash_update(h, key)
+                hash_tree(h, self.settings[key])
+        
+        return h.hexdigest()
+    
+    def evaluate_model(self, alpha, mach, altitude):
+        
+        # a bare state with just the freestream Fidelity_Zero needs, one row per point
+        n     = alpha.size
+        state = SUAVE.Analyses.Mission.Segments.Conditions.State()
+        state.conditions.update(SUAVE.Analyses.Mission.Segments.Conditions.Aerodynamics())
+        state.expand_rows(n)
+        
+        atmo       = SUAVE.Analyses.Atmospheric.US_Standard_1976().compute_values(altitude[:,None])
+        velocity   = mach[:,None] * atmo.speed_of_sound
+        freestream = state.conditions.freestream
+        freestream.altitude          = altitude[:,None]
+        freestream.mach_number       = mach[:,None]
+        freestream.velocity          = velocity
+        freestream.density           = atmo.density
+        freestream.dynamic_viscosity = atmo.dynamic_viscosity
+        freestream.temperature       = atmo.temperature
+        freestream.pressure          = atmo.pressure
+        freestream.speed_of_sound    = atmo.speed_of_sound
+        freestream.dynamic_pressure  = 0.5 * atmo.density * velocity**2
+        freestream.reynolds_number   = atmo.density * velocity / atmo.dynamic_viscosity
+        state.conditions.frames.inertial.velocity_vector[:,0] = velocity[:,0]
+        state.conditions.aerodynamics.angle_of_attack         = alpha[:,None]
+        
+        results = self.model(state)
+        
+        # totals from the results plus every lift and drag breakdown the model wrote into the conditions
+        columns = flatten_conditions(results, n, 'results.')
+        columns.update(flatten_conditions(state.conditions.aerodynamics.lift_breakdown, n, 'lift_breakdown.'))
+        columns.update(flatten_conditions(state.conditions.aerodynamics.drag_breakdown, n, 'drag_breakdown.'))
+        
+        return {name: column for name, column in columns.items() if not name.rsplit('.', 1)[-1].isdigit()}
+    
+    def build(self):
+        
+        grid    = np.meshgrid(self.angle_of_attack, self.mach, self.altitude, indexing='ij')
+        columns = self.evaluate_model(*[g.ravel() for g in grid])
+        
+        self.columns         = sorted(columns.keys())
+        values               = np.stack([columns[name].reshape(grid[0].shape) for name in self.columns], axis=-1)
+        self.interpolant     = RegularGridInterpolator((self.angle_of_attack, self.mach, self.altitude), values,
+                                                       bounds_error=False, fill_value=None)
+        self.built_increment = self.settings.drag_coefficient_increment
+        self.built_inputs    = self.inputs_hash()
+        self.cache.clear()
+        
+        return
+    
+    def lookup(self, alpha, mach, altitude):
+        
+        # exact repeats (the final pass after convergence, identical sweep cases) skip the interpolation
+        key = hashlib.sha1(alpha.tobytes() + mach.tobytes() + altitude.tobytes()).digest()
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        
+        values = self.interpolant(np.stack((alpha, mach, altitude), axis=-1))
+        self.cache[key] = values
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        
+        return values
+    
+    def validate(self):
+        
+        # off grid points against the direct method, reported as the surrogate's error bound
+        rng   = np.random.default_rng(0)
+        n     = self.validation_points
+        alpha = rng.uniform(self.angle_of_attack[0], self.angle_of_attack[-1], n)
+        mach  = rng.uniform(self.mach[0], self.mach[-1], n)
+        alt   = rng.uniform(self.altitude[0], self.altitude[-1], n)
+        
+        direct = self.evaluate_model(alpha, mach, alt)
+        values = self.interpolant(np.stack((alpha, mach, alt), axis=-1))
+        for name in ('results.lift.total', 'results.drag.total'):
+            error = np.abs(values[:,self.columns.index(name)] - direct[name])
+            self.error_bound[name.split('.')[1]] = Data(absolute = np.max(error),
+                                                        relative = np.max(error / np.maximum(np.abs(direct[name]), 1e-12)))
+        
+        return self.error_bound
+    
+    def evaluate(self, state):
+        
+        # a sweep that moved the airframe (wetted areas, wing geometry) or a setting gets a new table, never the old one
+        if self.inputs_hash() != self.built_inputs:
+            print('aero surrogate inputs changed since the table was built, rebuilding it')
+            self.finalize()
+            report_aero_surrogate(Data(aerodynamics = self))
+        
+        conditions = state.conditions
+        values     = self.lookup(np.ascontiguousarray(conditions.aerodynamics.angle_of_attack[:,0]),
+                                 np.ascontiguousarray(conditions.freestream.mach_number[:,0]),
+                                 np.ascontiguousarray(conditions.freestream.altitude[:,0]))
+        
+        results = Data()
+        for i, name in enumerate(self.columns):
+            target, path = name.split('.', 1)
+            if target == 'results':
+                set_condition(results, path, values[:,i,None].copy())
+            else:
+                set_condition(conditions.aerodynamics, name, values[:,i,None].copy())
+        
+        # the gear drag increment is a flat add, so a sweep can move it without rebuilding the table
+        increment           = self.settings.drag_coefficient_increment - self.built_increment
+        results.drag.total += increment
+        breakdown           = conditions.aerodynamics.drag_breakdown
+        if 'drag_breakdown.total' in self.columns:
+            breakdown.total += increment
+        if 'drag_breakdown.drag_coefficient_increment' in self.columns:
+            breakdown.drag_coefficient_increment += increment
+        
+        return results
+
+def report_aero_surrogate(analyses):
+    
+    # nothing is flown on the table without saying how far it is from the direct method
+    if isinstance(analyses.aerodynamics, Aerodynamics_Surrogate):
+        for name, bound in analyses.aerodynamics.error_bound.items():
+            print('aero surrogate %s error bound: %.2e absolute, %.2e relative' % (name, bound.absolute, bound.relative))
+    
+    return
+
+def aerodynamics_surrogate(aerodynamics):
+    
+    surrogate          = Aerodynamics_Surrogate()
+    surrogate.model    = aerodynamics
+    surrogate.geometry = aerodynamics.geometry
+    surrogate.settings = aerodynamics.settings
+    
+    return surrogate
+
+
+# ----------------------------------------------------------------------
+#   Vehicle Snapshots
+# ----------------------------------------------------------------------
+
+snapshot_version = 2
+
+# everything the snapshot's vehicle and analyses are built by, editing any of these invalidates it
+snapshot_build_functions = ['vehicle_setup', 'prop_setup', 'base_analysis', 'landing_gear_drag_area']
+
+def build_fingerprint():
+    
+    h = hashlib.sha256()
+    hash_update(h, SUAVE.__version__)
+    for name in snapshot_build_functions:
+        hash_update(h, inspect.getsource(globals()[name]))
+    hash_update(h, landing_gear_drag_factor)
+    
+    # the prop inputs along with the airfoil and polar files, the engine power is in vehicle_setup's source
+    hash_update(h, prop_design_key(prop_setup(Data(sea_level_power = 1.))))
+    
+    return h.hexdigest()
+
+def hash_airframe(h, vehicle):
+    
+    # the wing and fuselage geometry the aerodynamics are computed from
+    hash_update(h, vehicle.reference_area)
+    
+    for wing in vehicle.wings.values():
+        hash_update(h, wing.tag)
+        for value in (wing.areas.reference, wing.areas.wetted, wing.spans.projected, wing.chords.root, wing.chords.tip,
+                      wing.chords.mean_aerodynamic, wing.aspect_ratio, wing.taper, wing.origin):
+            hash_update(h, value)
+    
+    for fuselage in vehicle.fuselages.values():
+        hash_update(h, fuselage.tag)
+        for value in (fuselage.lengths.total, fuselage.width, fuselage.heights.maximum, fuselage.areas.wetted,
+                      fuselage.effective_diameter):
+            hash_update(h, value)
+    
+    return h
+
+def vehicle_validation_hash(vehicle):
+    
+    # the geometry and masses that every analysis depends on
+    h = hashlib.sha256()
+    hash_airframe(h, vehicle)
+    for name in ('max_takeoff', 'takeoff', 'max_zero_fuel'):
+        hash_update(h, vehicle.mass_properties[name])
+    
+    prop = cherokee_propeller(vehicle)
+    for value in (prop.tip_radius, prop.chord_distribution, prop.twist_distribution, prop.radius_distribution):
+        hash_update(h, value)
+    
+    return h.hexdigest()
+
+def save_snapshot(path, vehicle, analyses):
+    
+    # small header first so a stale file is turned away before the big unpickle
+    header = {'version'           : snapshot_version,
+              'suave_version'     : SUAVE.__version__,
+              'build_fingerprint' : build_fingerprint(),
+              'validation_hash'   : vehicle_validation_hash(vehicle)}
+    
+    temp = path + '.' + str(os.getpid()) + '.tmp'
+    with open(temp, 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump((vehicle, analyses), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp, path)
+    
+    return header
+
+def load_snapshot(path):
+    
+    with open(path, 'rb') as f:
+        header = pickle.load(f)
+        if header['version'] != snapshot_version or header['suave_version'] != SUAVE.__version__:
+            raise ValueError('snapshot ' + path + ' was written by another version, rebuild it')
+        if header['build_fingerprint'] != build_fingerprint():
+            raise ValueError('snapshot ' + path + ' was built from a different model, rebuilding it')
+        vehicle, analyses = pickle.load(f)
+    
+    if vehicle_validation_hash(vehicle) != header['validation_hash']:
+        raise ValueError('snapshot ' + path + ' does not match its validation hash')
+    
+    return vehicle, analyses
+
+def load_vehicle_and_analyses(snapshot_path=None):
+    
+    # a finalized vehicle and analyses, from the snapshot when there is a good one
+    if snapshot_path is not None and os.path.exists(snapshot_path):
+        try:
+            return load_snapshot(snapshot_path)
+        except ValueError as e:
+            print(str(e))
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+            #truncated by a killed run, or pickled against classes that have since moved
+            print('snapshot ' + snapshot_path + ' could not be read (' + type(e).__name__ + '), rebuilding it')
+        os.remove(snapshot_path)
+    
+    vehicle  = vehicle_setup()
+    analyses = base_analysis(vehicle)
+    analyses.finalize()
+    
+    if snapshot_path is not None:
+        save_snapshot(snapshot_path, vehicle, analyses)
+    
+    return vehicle, analyses
+
+
+# ----------------------------------------------------------------------
+#   Solver Tracing
+# ----------------------------------------------------------------------
+
+class Solver_Tracer:
+    
+    # one record per residual evaluation, one per root find, callback(record) after every evaluation
+    def __init__(self, callback=None, record_unknowns=True):
+        self.callback        = callback
+        self.record_unknowns = record_unknowns
+        self.evaluations     = []
+        self.solves          = []
+        self.counts          = {}
+        self.attached        = []
+        self.current         = None
+    
+    def attach(self, mission):
+        
+        # attach after the mission is fully set up, the iterate process gets wrapped in place,
+        # a segment that is already traced is left alone so nothing gets timed or counted twice
+        for segment in mission.segments.values():
+            if any(segment is attached for attached in self.attached):
+                continue
+            self.attached.append(segment)
+            self.wrap_process(segment.process.iterate, '')
+            segment.process.iterate      = self.traced_iterate(segment.tag, segment.process.iterate)
+            segment.settings.root_finder = self.traced_root_finder(segment.tag, segment.settings.get('root_finder', fsolve))
+        
+        return mission
+    
+    def wrap_process(self, process, prefix):
+        
+        for key, step in list(process.items()):
+            if isinstance(step, dict):
+                self.wrap_process(step, prefix + key + '.')
+            elif callable(step):
+                process[key] = self.timed_step(prefix + key, step)
+        
+        return
+    
+    def timed_step(self, name, step):
+        
+        def traced(*args, **kwargs):
+            start  = time.perf_counter()
+            result = step(*args, **kwargs)
+            if self.current is not None:
+                steps       = self.current['steps']
+                steps[name] = steps.get(name, 0.) + time.perf_counter() - start
+            return result
+        
+        return traced
+    
+    def traced_iterate(self, tag, iterate):
+        
+        def traced(segment):
+            record = {'segment'    : tag,
+                      'evaluation' : self.counts.get(tag, 0),
+                      'steps'      : {}}
+            self.counts[tag] = record['evaluation'] + 1
+            self.current = record
+            start        = time.perf_counter()
+            iterate(segment)
+            
+            record['time']          = time.perf_counter() - start
+            record['residual_norm'] = float(np.linalg.norm(segment.state.residuals.pack_array()))
+            if self.record_unknowns:
+                record['unknowns']  = {name: np.ravel(value).tolist() for name, value in segment.state.unknowns.items()}
+            
+            self.current = None
+            self.evaluations.append(record)
+            if self.callback is not None:
+                self.callback(record)
+            
+            return
+        
+        return traced
+    
+    def traced_root_finder(self, tag, root_finder):
+        
+        def traced(*args, **kwargs):
+            start  = time.perf_counter()
+            result = root_finder(*args, **kwargs)
+            solve  = {'segment': tag, 'time': time.perf_counter() - start}
+            if isinstance(result, tuple):
+                x, info, ier, msg = result
+                solve.update({'nfev': int(info['nfev']), 'ier': int(ier), 'message': msg})
+            self.solves.append(solve)
+            return result
+        
+        return traced
+    
+    def summary(self):
+        
+        # time per process step over all evaluations, plus the solver totals per segment
+        steps = {}
+        for record in self.evaluations:
+            for name, elapsed in record['steps'].items():
+                calls, total = steps.get(name, (0, 0.))
+                steps[name]  = (calls + 1, total + elapsed)
+        
+        segments = {}
+        for record in self.evaluations:
+            segment = segments.setdefault(record['segment'], {'evaluations': 0, 'time': 0.})
+            segment['evaluations']  += 1
+            segment['time']         += record['time']
+            segment['residual_norm'] = record['residual_norm']
+        for solve in self.solves:
+            segments[solve['segment']].update({k: v for k, v in solve.items() if k not in ('segment', 'time')})
+        
+        return {'steps': steps, 'segments': segments}
+    
+    def print_summary(self):
+        
+        summary = self.summary()
+        total   = sum(total for calls, total in summary['steps'].values()) or 1.
+        
+        print('%-40s %7s %11s %10s %7s' % ('step', 'calls', 'total [s]', 'mean [ms]', 'share'))
+        for name, (calls, elapsed) in sorted(summary['steps'].items(), key=lambda item: -item[1][1]):
+            print('%-40s %7d %11.4f %10.3f %6.1f%%' % (name, calls, elapsed, 1e3 * elapsed / calls, 100. * elapsed / total))
+        
+        print()
+        for tag, segment in summary['segments'].items():
+            print('%s: %d evaluations, %.3f s, final residual norm %.3e, %s' % (tag, segment['evaluations'], segment['time'],
+                  segment['residual_norm'], segment.get('message', 'no solver message')))
+        
+        return
+    
+    def save(self, path):
+        
+        with open(path, 'w') as f:
+            json.dump({'evaluations': self.evaluations, 'solves': self.solves, 'summary': self.summary()}, f, indent=1)
+        
+        return path
+
+
+# ----------------------------------------------------------------------
+#   Warm Started Solves
+# ----------------------------------------------------------------------
+
+# how far apart two cruise cases are, one unit of each counts the same
+warm_start_scales = {'altitude'  : 1000. * Units.feet,
+                     'air_speed' : 10.   * Units.knots,
+                     'distance'  : 50.   * Units.nautical_mile,
+                     'rpm'       : 100.}
+
+def counted_fsolve(fun, x0, args=(), **kwargs):
+    
+    # plain fsolve, but the evaluation count is kept on the segment
+    x, info, ier, msg = fsolve(fun, x0, args=args, **kwargs)
+    segment = args[0] if isinstance(args, tuple) else args
+    segment.state.numerics.function_evaluations = int(info['nfev'])
+    
+    return x, info, ier, msg
+
+def cruise_values(variant):
+    
+    # anything a variant leaves out is the mission_setup() default
+    defaults = inspect.signature(mission_setup).parameters
+    return {name: variant.get(name, defaults[name].default) for name in warm_start_scales.keys()}
+
+def converged_unknowns(segment):
+    return {name: np.array(value) for name, value in segment.state.unknowns.items()}
+
+def seed_unknowns(segment, unknowns):
+    
+    for name, value in unknowns.items():
+        if name in segment.state.unknowns:
+            segment.state.unknowns[name] = np.array(value)
+    
+    return segment
+
+def interpolate_unknowns(solved, vector, neighbours=3):
+    
+    # inverse distance weighting over the nearest converged cases, an exact match is taken as is
+    distances = np.array([np.linalg.norm(vector - solved_vector) for solved_vector, unknowns in solved])
+    nearest   = np.argsort(distances)[:neighbours]
+    if distances[nearest[0]] == 0.:
+        return solved[nearest[0]][1]
+    
+    weights = 1. / distances[nearest]
+    weights = weights / np.sum(weights)
+    names   = solved[nearest[0]][1].keys()
+    
+    return {name: sum(w * solved[i][1][name] for w, i in zip(weights, nearest)) for name in names}
+
+def continuation_grid(altitudes=np.arange(6000., 10001., 1000.), air_speeds=np.arange(106., 127., 5.)):
+    
+    # ft and kt, walked back and forth in air speed so every case sits next to the one solved before it
+    variants = []
+    for i, altitude in enumerate(altitudes):
+        for air_speed in (air_speeds if i % 2 == 0 else air_speeds[::-1]):
+            variants.append({'altitude': altitude * Units.feet, 'air_speed': air_speed * Units.knots})
+    
+    return variants
+
+def solve_with_continuation(analyses, vehicle, variants, number_control_points=16, neighbours=3, compare_cold_start=False):
+    
+    solved  = []
+    results = []
+    report  = Column_Store()
+    scales  = np.array(list(warm_start_scales.values()))
+    
+    for index, variant in enumerate(variants):
+        values = cruise_values(variant)
+        vector = np.array(list(values.values())) / scales
+        
+        mission = mission_setup(analyses, vehicle, number_control_points=number_control_points, **values)
+        segment = mission.segments.cruise
+        segment.settings.root_finder = counted_fsolve
+        if solved:
+            seed_unknowns(segment, interpolate_unknowns(solved, vector, neighbours))
+        results.append(mission.evaluate())
+        
+        row = {'case': index, 'function_evaluations': segment.state.numerics.function_evaluations, 
+               'converged': bool(segment.state.numerics.converged)}
+        row.update(values)
+        
+        # the same case again from the default guess, only to measure what the seed saved
+        if compare_cold_start:
+            cold = mission_setup(analyses, vehicle, number_control_points=number_control_points, **values)
+            cold.segments.cruise.settings.root_finder = counted_fsolve
+            cold.evaluate()
+            row['cold_function_evaluations'] = cold.segments.cruise.state.numerics.function_evaluations
+        
+        if row['converged']:
+            solved.append((vector, converged_unknowns(segment)))
+        report.append(row)
+    
+    columns = report.arrays()
+    if compare_cold_start:
+        warm, cold = np.sum(columns['function_evaluations']), np.sum(columns['cold_function_evaluations'])
+        print('warm starts: %d function evaluations against %d cold, %.1f%% fewer' % (warm, cold, 100. * (1. - warm / cold)))
+    
+    return results, report
+
+
+# ----------------------------------------------------------------------
+#   Adaptive Control Points
+# ----------------------------------------------------------------------
+
+adaptive_control_points = (4, 6, 8, 12, 16, 24, 32, 48, 64)
+
+def resample_unknowns(discretization_method, unknowns, n_old, n_new):
+    
+    # a coarse solution carried onto the finer chebyshev points in nondimensional time
+    x_old = discretization_method(n_old)[0][:,0]
+    x_new = discretization_method(n_new)[0][:,0]
+    
+    return {name: np.stack([np.interp(x_new, x_old, column) for column in value.T], axis=1) 
+            for name, value in unknowns.items()}
+
+def adaptive_cruise(analyses, vehicle, tolerance=1e-4, levels=adaptive_control_points, tracer=None, **cruise):
+    
+    # cruise takes the mission_setup() keywords, a tracer follows every level that gets solved
+    previous = None
+    error    = np.inf
+    for n in levels:
+        mission = mission_setup(analyses, vehicle, number_control_points=n, **cruise)
+        segment = mission.segments.cruise
+        if tracer is not None:
+            tracer.attach(mission)
+        if previous is not None:
+            seed_unknowns(segment, resample_unknowns(segment.state.numerics.discretization_method, previous.unknowns,
+                                                     previous.number_control_points, n))
+        results = mission.evaluate()
+        
+        # an unconverged level says nothing about the discretization, it is neither compared against nor seeded from
+        if not segment.state.numerics.converged:
+            print('adaptive cruise: %d control points did not converge, skipping the level' % n)
+            continue
+        summary = mission_summary(results)
+        
+        # the change from the last converged level is the error estimate for fuel burn and time
+        error = np.inf
+        if previous is not None:
+            error = max(abs(summary.fuel_burn - previous.fuel_burn) / abs(summary.fuel_burn),
+                        abs(summary.flight_time - previous.flight_time) / abs(summary.flight_time))
+        
+        previous                       = Data()
+        previous.number_control_points = n
+        previous.unknowns              = converged_unknowns(segment)
+        previous.fuel_burn             = summary.fuel_burn
+        previous.flight_time           = summary.flight_time
+        previous.results               = results
+        
+        if error <= tolerance:
+            break
+    
+    if previous is None:
+        raise RuntimeError('adaptive cruise: the cruise did not converge at any of ' + str(list(levels)) + ' control points')
+    
+    adaptive                       = Data()
+    adaptive.number_control_points = previous.number_control_points
+    adaptive.fuel_burn             = previous.fuel_burn
+    adaptive.flight_time           = previous.flight_time
+    adaptive.error                 = error
+    adaptive.converged             = error <= tolerance
+    adaptive.results               = previous.results
+    
+    print('adaptive cruise: %d control points, estimated error %.2e (tolerance %.2e)' % (adaptive.number_control_points,
+          error, tolerance))
+    
+    return adaptive
+
+
+# ----------------------------------------------------------------------
+#   Flight Plans
+# ----------------------------------------------------------------------
+
+# climb to 8000 ft, cruise, then a constant speed descent to 4000 ft
+default_flight_plan = [
+    {'type': 'climb',   'tag': 'climb',   'altitude_start': 0.    * Units.feet, 'altitude_end': 8000. * Units.feet,
+     'air_speed': 85.  * Units.mph,   'climb_rate': 500. * Units['ft/min']},
+    {'type': 'cruise',  'tag': 'cruise',  'altitude': 8000. * Units.feet, 'air_speed': 116. * Units.knots,
+     'distance': 100. * Units.nautical_mile},
+    {'type': 'descent', 'tag': 'descent', 'altitude_start': 8000. * Units.feet, 'altitude_end': 4000. * Units.feet,
+     'air_speed': 110. * Units.knots, 'descent_rate': 500. * Units['ft/min'], 'throttle': 0.3},
+]
+
+# converged legs solved in this process, the whole state keyed by leg, start and model so an identical leg is
+# copied rather than solved, and the unknowns keyed by the leg alone so one that starts elsewhere is seeded from them
+solved_segments      = OrderedDict()
+solved_segments_size = 256
+segment_cache        = OrderedDict()
+segment_cache_size   = 1024
+
+def flight_plan_analysis(vehicle, aero_surrogate=False):
+    
+    # one set of analyses shared by every leg, the direct Fidelity_Zero unless the table is asked for
+    analyses = base_analysis(vehicle, aero_surrogate=aero_surrogate)
+    analyses.finalize()
+    report_aero_surrogate(analyses)
+    
+    return analyses
+
+def segment_key(kind, spec, number_control_points):
+    
+    h = hashlib.sha256()
+    hash_update(h, kind)
+    hash_update(h, number_control_points)
+    for name in sorted(spec.keys()):
+        hash_update(h, name)
+        hash_update(h, spec[name])
+    
+    return h.hexdigest()
+
+def segment_model_key(segment):
+    
+    # the vehicle, aero settings and engine the leg is flown with, read off the leg's own analyses
+    aerodynamics = segment.analyses.aerodynamics
+    vehicle      = aerodynamics.geometry
+    engine       = cherokee_engine(vehicle)
+    
+    h = hashlib.sha256()
+    hash_update(h, vehicle_validation_hash(vehicle))
+    hash_update(h, type(aerodynamics).__name__)
+    hash_tree(h, aerodynamics.settings)
+    hash_update(h, engine.sea_level_power)
+    hash_update(h, engine.power_specific_fuel_consumption)
+    for surrogate in cherokee_propeller(vehicle).airfoil_cl_surrogates.values():
+        hash_update(h, type(surrogate).__name__)
+    
+    return h
+
+def solved_segment_key(segment):
+    
+    h = segment_model_key(segment)
+    hash_update(h, segment.cache_key)
+    
+    # where the leg before left off, the first leg starts at the takeoff mass which the model key already has
+    initials = segment.state.initials
+    if initials:
+        conditions = initials.conditions
+        for value in (conditions.weights.total_mass[-1], conditions.frames.inertial.time[-1],
+                      conditions.frames.inertial.position_vector[-1]):
+            hash_update(h, value)
+    
+    return h.hexdigest()
+
+class Reused_Segment_Process(SUAVE.Analyses.Process):
+    
+    # the leg's own process, skipped when the same leg was solved from the same start on the same model
+    def evaluate(self, segment):
+        
+        key      = solved_segment_key(segment)
+        initials = segment.state.initials
+        
+        if key in solved_segments:
+            solved_segments.move_to_end(key)
+            segment.state          = deepcopy(solved_segments[key])
+            segment.state.initials = initials
+            segment.reused         = True
+            return Data()
+        
+        results        = SUAVE.Analyses.Process.evaluate(self, segment)
+        segment.reused = False
+        
+        # stored without the leg before it, the next mission hands over its own
+        if segment.state.numerics.converged:
+            segment.state.initials = Data()
+            solved_segments[key]   = deepcopy(segment.state)
+            segment.state.initials = initials
+            if len(solved_segments) > solved_segments_size:
+                solved_segments.popitem(last=False)
+        
+        return results
+
+def seed_from_segment_cache(segment):
+    
+    unknowns = segment_cache.get(segment.cache_key)
+    if unknowns is not None:
+        seed_unknowns(segment, unknowns)
+        segment_cache.move_to_end(segment.cache_key)
     
     return
 
+def store_in_segment_cache(segment):
+    
+    if segment.state.numerics.converged:
+        segment_cache[segment.cache_key] = converged_unknowns(segment)
+        if len(segment_cache) > segment_cache_size:
+            segment_cache.popitem(last=False)
+    
+    return
+
+def mission_from_specs(analyses, vehicle, specs, number_control_points=16, rpm=2600):
+    
+    mission = SUAVE.Analyses.Mission.Sequential_Segments()
+    mission.tag = 'the_flight_plan'
+    
+    Segments      = SUAVE.Analyses.Mission.Segments
+    base_segment  = Segments.Segment()
+    segment_types = {'climb'   : Segments.Climb.Constant_Speed_Constant_Rate,
+                     'cruise'  : Segments.Cruise.Constant_Speed_Constant_Altitude,
+                     'descent' : Segments.Descent.Constant_Speed_Constant_Rate}
+    
+    for spec in specs:
+        spec     = dict(spec)
+        kind     = spec.pop('type')
+        tag      = spec.pop('tag', kind)
+        throttle = spec.pop('throttle', 1.0)
+        rpm_i    = spec.pop('rpm', rpm)
+        
+        # container keys are tags, so a repeated leg gets a numbered tag
+        base_tag = tag
+        count    = 1
+        while tag in mission.segments:
+            count += 1
+            tag    = base_tag + '_' + str(count)
+        
+        segment     = segment_types[kind](base_segment)
+        segment.tag = tag
+        segment.analyses.extend( analyses )
+        for name, value in spec.items():
+            segment[name] = value
+        
+        ones_row                                        = segment.state.ones_row
+        segment.state.numerics.number_control_points    = number_control_points
+        segment.state.unknowns.throttle                 = throttle * ones_row(1)
+        segment = vehicle.networks.internal_combustion.add_unknowns_and_residuals_to_segment(segment,rpm=rpm_i)
+        
+        segment.process.iterate.conditions.stability    = SUAVE.Methods.skip
+        segment.process.finalize.post_process.stability = SUAVE.Methods.skip
+        
+        # the same leg flown before starts from where it converged last time
+        segment.cache_key                               = segment_key(kind, dict(spec, throttle=throttle, rpm=rpm_i), 
+                                                                      number_control_points)
+        segment.process.initialize.segment_cache        = seed_from_segment_cache
+        segment.process.finalize.segment_cache          = store_in_segment_cache
+        
+        # and if it also starts where it did then, on the same model, its solution is copied over
+        process = Reused_Segment_Process()
+        for key, step in segment.process.items():
+            process[key] = step
+        segment.process = process
+        segment.reused  = False
+        
+        mission.append_segment(segment)
+    
+    return mission
+
+
+# ----------------------------------------------------------------------
+#   POH Charts
+# ----------------------------------------------------------------------
+
+# only the POH power setting table is transcribed, so RPM is the one thing checked against the manual,
+# speed, fuel flow and range at those settings are the model's own with nothing in the POH to compare against yet
+poh_power_table = os.path.join(poh_folder, 'power_setting_table.csv')
+poh_air_speeds  = np.linspace(80., 140., 13) * Units.knots # spans 55% to 75% power over the POH altitudes
+avgas_density   = 6. * Units.pounds / Units.gallon
+poh_max_rpm_deviation = 100. # furthest the model's RPM may sit from the POH before the chart fails
+
+def read_poh_table(path=poh_power_table):
+    
+    # comment lines start with #, blank cells are where the POH has nothing
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(line for line in f if not line.startswith('#')))
+    
+    table = {}
+    for name in rows[0].keys():
+        table[name] = np.array([float(row[name]) if row[name].strip() else np.nan for row in rows])
+    
+    return table
+
+def poh_percent_powers(table):
+    return [int(name.split('_')[1]) for name in table.keys() if name.startswith('rpm_')]
+
+def poh_power_chart(analyses, vehicle, table=None, air_speeds=poh_air_speeds, number_control_points=4, 
+                    distance=10. * Units.nautical_mile):
+    
+    if table is None:
+        table = read_poh_table()
+    altitudes      = table['pressure_altitude_ft'] * Units.feet
+    percent_powers = poh_percent_powers(table)
+    
+    # every altitude and air speed in one batched solve, a short leg is all a steady cruise point needs
+    alt, speed = np.meshgrid(altitudes, air_speeds, indexing='ij')
+    batch      = evaluate_cruise_batch(analyses, vehicle, alt.ravel(), speed.ravel(), distance, 2400., 
+                                       number_control_points)
+    
+    shape          = alt.shape
+    percent        = np.mean(batch.power, axis=1).reshape(shape) / cherokee_engine(vehicle).sea_level_power * 100.
+    rpm            = np.mean(batch.rpm, axis=1).reshape(shape)
+    fuel_flow      = np.mean(batch.fuel_mass_rate, axis=1).reshape(shape)
+    converged      = batch.converged.reshape(shape)
+    
+    chart                = Data()
+    chart.altitude       = altitudes
+    chart.percent_power  = np.array(percent_powers, dtype=float)
+    chart.rpm            = np.full((len(altitudes), len(percent_powers)), np.nan)
+    chart.true_air_speed = np.full_like(chart.rpm, np.nan)
+    chart.fuel_flow      = np.full_like(chart.rpm, np.nan)
+    chart.range          = np.full_like(chart.rpm, np.nan)
+    
+    # read each altitude's speed line at the POH power settings, never extrapolating past it
+    for i in range(len(altitudes)):
+        points = converged[i]
+        order  = np.argsort(percent[i][points])
+        x      = percent[i][points][order]
+        if x.size < 2:
+            continue
+        inside = (chart.percent_power >= x[0]) & (chart.percent_power <= x[-1])
+        for values, out in ((rpm, chart.rpm), (speed, chart.true_air_speed), (fuel_flow, chart.fuel_flow)):
+            out[i, inside] = np.interp(chart.percent_power[inside], x, values[i][points][order])
+    
+    # still air, full tanks burned at the cruise fuel flow, no climb, descent or reserve
+    chart.range         = chart.true_air_speed * fuel_capacity * avgas_density / chart.fuel_flow
+    
+    chart.poh_rpm       = np.column_stack([table['rpm_' + str(p)] for p in percent_powers])
+    chart.rpm_deviation = chart.rpm - chart.poh_rpm
+    
+    return chart
+
+def poh_chart_columns(chart):
+    
+    # one row per altitude and power setting, in the units the POH is printed in
+    n_alt, n_power = chart.rpm.shape
+    return {'pressure_altitude_ft' : np.repeat(chart.altitude / Units.feet, n_power),
+            'percent_power'        : np.tile(chart.percent_power, n_alt),
+            'rpm'                  : chart.rpm.ravel(),
+            'poh_rpm'              : chart.poh_rpm.ravel(),
+            'rpm_deviation'        : chart.rpm_deviation.ravel(),
+            'true_air_speed_mph'   : chart.true_air_speed.ravel() / Units.mph,
+            'fuel_flow_gph'        : chart.fuel_flow.ravel() / avgas_density / (Units.gallon / Units.hour),
+            'range_nmi'            : chart.range.ravel() / Units.nautical_mile}
+
+def print_poh_chart(chart):
+    
+    columns = poh_chart_columns(chart)
+    n_power = len(chart.percent_power)
+    cell    = lambda value, fmt: ' ' * len(fmt % 0) if np.isnan(value) else fmt % value
+    
+    # laid out like the POH power setting table, with the model's speed, fuel flow and range next to it
+    header = '%8s' % 'Alt ft' + ''.join('  | %3d%% RPM  POH   dev  TAS mph  GPH   NM' % p for p in chart.percent_power)
+    print(header)
+    print('-' * len(header))
+    for i, altitude in enumerate(chart.altitude / Units.feet):
+        line = '%8d' % altitude
+        for k in range(i * n_power, (i + 1) * n_power):
+            line += '  |     ' + cell(columns['rpm'][k], '%4d') + ' ' + cell(columns['poh_rpm'][k], '%4d') + \
+                    ' ' + cell(columns['rpm_deviation'][k], '%+5d') + '    ' + cell(columns['true_air_speed_mph'][k], '%5.1f') + \
+                    ' ' + cell(columns['fuel_flow_gph'][k], '%4.1f') + ' ' + cell(columns['range_nmi'][k], '%4d')
+        print(line)
+    
+    deviation = chart.rpm_deviation[~np.isnan(chart.rpm_deviation)]
+    if deviation.size:
+        print('RPM against the POH: %d points, mean %+.0f, max |dev| %.0f, rms %.0f' % (
+            deviation.size, np.mean(deviation), np.max(np.abs(deviation)), np.sqrt(np.mean(deviation**2))))
+    
+    return
+
+def check_poh_chart(chart, max_rpm_deviation=poh_max_rpm_deviation):
+    
+    # every POH cell has to be reached by the model and land within the tolerance
+    reference = ~np.isnan(chart.poh_rpm)
+    missing   = reference & np.isnan(chart.rpm)
+    outside   = reference & ~missing & (np.abs(chart.rpm_deviation) > max_rpm_deviation)
+    
+    for i, k in zip(*np.nonzero(missing | outside)):
+        print('  %5d ft %3d%% power: model %s RPM, POH %d RPM' % (chart.altitude[i] / Units.feet, chart.percent_power[k],
+              'no' if missing[i,k] else '%d' % chart.rpm[i,k], chart.poh_rpm[i,k]))
+    passed = not np.any(missing | outside)
+    print('POH check %s: %d of %d points outside %.0f RPM, %d not reached' % ('passed' if passed else 'FAILED', 
+          np.sum(outside), np.sum(reference), max_rpm_deviation, np.sum(missing)))
+    
+    return passed
+
+
+# ----------------------------------------------------------------------
+#   Streaming Plots
+# ----------------------------------------------------------------------
+
+# each figure is a column of (x, y) channel pairs, only these channels are ever pulled out of the results
+plot_figures = OrderedDict([
+    ('flight_conditions',        [('time', 'altitude'), ('time', 'air_speed'), ('time', 'throttle'), ('time', 'rpm')]),
+    ('aerodynamic_coefficients', [('time', 'angle_of_attack'), ('time', 'lift_coefficient'), ('time', 'drag_coefficient')]),
+    ('weight_and_power',         [('time', 'mass'), ('time', 'fuel_mass_rate'), ('time', 'power')]),
+])
+
+# channels go on the axes in the units a pilot reads them in
+plot_units = {
+    'time'             : (Units.min, 'min'),
+    'altitude'         : (Units.feet, 'ft'),
+    'air_speed'        : (Units.knots, 'kt'),
+    'rpm'              : (1., 'rpm'),
+    'power'            : (Units.horsepower, 'hp'),
+    'angle_of_attack'  : (Units.deg, 'deg'),
+    'mass'             : (Units.pounds, 'lb'),
+    'fuel_mass_rate'   : (Units.pounds / Units.hour, 'lb/h'),
+}
+
+class Mission_Plotter:
+    
+    # Agg canvases written straight to files, the figures and axes stay alive so runs can keep being added
+    def __init__(self, folder, figures=plot_figures, dpi=100, max_legend=10):
+        
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        self.folder     = folder
+        self.dpi        = dpi
+        self.max_legend = max_legend
+        self.runs       = 0
+        self.figures    = OrderedDict()
+        self.axes       = OrderedDict()
+        self.channels   = sorted({name for pairs in figures.values() for pair in pairs for name in pair})
+        
+        for tag, pairs in figures.items():
+            figure = Figure(figsize=(8, 2.2 * len(pairs)))
+            FigureCanvasAgg(figure)
+            axes   = figure.subplots(len(pairs), 1, sharex=True, squeeze=False)[:,0]
+            for ax, (x, y) in zip(axes, pairs):
+                ax.set_ylabel(y.replace('_', ' ') + ' (' + plot_units.get(y, (1., '-'))[1] + ')')
+                ax.grid(True)
+            axes[-1].set_xlabel(pairs[-1][0].replace('_', ' ') + ' (' + plot_units.get(pairs[-1][0], (1., '-'))[1] + ')')
+            self.figures[tag] = figure
+            self.axes[tag]    = list(zip(axes, pairs))
+    
+    def add_run(self, columns, label=None):
+        
+        # one more line on every axis, what is already drawn stays as it is
+        for axes in self.axes.values():
+            for ax, (x, y) in axes:
+                ax.plot(np.asarray(columns[x]) / plot_units.get(x, (1.,))[0], 
+                        np.asarray(columns[y]) / plot_units.get(y, (1.,))[0], label=label)
+                ax.relim()
+                ax.autoscale_view()
+        self.runs += 1
+    
+    def add_results(self, results, label=None):
+        self.add_run({name: results_channel(results, name) for name in self.channels}, label)
+    
+    def add_batch(self, batch, labels=None):
+        for case in range(len(batch.time)):
+            self.add_run({name: batch[name][case] for name in self.channels}, 
+                         None if labels is None else labels[case])
+    
+    def clear(self):
+        
+        # drop the runs but keep the figures and axes for the next set
+        for axes in self.axes.values():
+            for ax, pair in axes:
+                for line in list(ax.lines):
+                    line.remove()
+        self.runs = 0
+    
+    def save(self, format='png'):
+        
+        os.makedirs(self.folder, exist_ok=True)
+        paths = []
+        for tag, figure in self.figures.items():
+            
+            # a legend only while it is still readable
+            for ax, pair in self.axes[tag][:1]:
+                if ax.get_legend() is not None:
+                    ax.get_legend().remove()
+                if 0 < self.runs <= self.max_legend and any(line.get_label()[:1] != '_' for line in ax.lines):
+                    ax.legend(fontsize='small')
+            
+            path = os.path.join(self.folder, tag + '.' + format)
+            figure.savefig(path, dpi=self.dpi)
+            paths.append(path)
+        
+        return paths
+    
+    def close(self):
+        self.figures.clear()
+        self.axes.clear()
+
+
+# ----------------------------------------------------------------------
+#   Mission Service
+# ----------------------------------------------------------------------
+
+# queries come in as pilots think of them, these are the units and the grid they get snapped to,
+# so a query a few feet or a fraction of a knot from a solved one is answered from the cache
+service_units    = {'altitude': (Units.feet, 50.), 'air_speed': (Units.knots, 0.5), 'distance': (Units.nautical_mile, 0.5)}
+service_defaults = {'altitude': 9000., 'air_speed': 116., 'distance': 100.}
+service_snapshot = os.path.join(cache_folder, 'service_snapshot.pkl')
+
+def run_service_query(query):
+    
+    # runs in a pool worker, the vehicle and analyses were built once by init_sweep_worker
+    cruise  = {name: value * service_units[name][0] for name, value in query.items()}
+    mission = mission_setup(sweep_worker.analyses, sweep_worker.vehicle, **cruise)
+    summary = mission_summary(mission.evaluate())
+    
+    return {key: (bool(value) if key == 'converged' else float(value)) for key, value in summary.items()}
+
+def service_ready():
+    return os.getpid()
+
+class Request_Too_Large(Exception):
+    pass
+
+class Mission_Service:
+    
+    def __init__(self, max_workers=2, snapshot_path=service_snapshot, cache_size=4096, ttl=3600., max_body=16384):
+        
+        self.max_workers   = max_workers
+        self.snapshot_path = snapshot_path
+        self.cache_size    = cache_size
+        self.ttl           = ttl
+        self.max_body      = max_body
+        self.cache         = OrderedDict()
+        self.in_flight     = {}
+        self.executor      = None
+        self.model         = None
+        self.stats         = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'solves': 0, 'errors': 0}
+    
+    def start(self):
+        
+        # the snapshot is checked against the current model and rebuilt here if it is stale,
+        # so every worker only unpickles it, then each worker is warmed up front
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        load_vehicle_and_analyses(self.snapshot_path)
+        self.model = build_fingerprint()
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_sweep_worker, 
+                                            initargs=(self.snapshot_path,))
+        for future in [self.executor.submit(service_ready) for _ in range(self.max_workers)]:
+            future.result()
+    
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+    
+    def normalize(self, query):
+        
+        unknown = set(query) - set(service_defaults)
+        if unknown:
+            raise ValueError('unknown query fields: ' + ', '.join(sorted(unknown)))
+        
+        values = {}
+        for name, default in service_defaults.items():
+            step = service_units[name][1]
+            try:
+                value = float(query.get(name, default))
+            except (TypeError, ValueError):
+                raise ValueError(name + ' has to be a number')
+            if not np.isfinite(value):
+                raise ValueError(name + ' has to be finite')
+            values[name] = round(value / step) * step
+        
+        return values
+    
+    def cached(self, key):
+        
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl:
+            del self.cache[key]
+            return None
+        self.cache.move_to_end(key)
+        
+        return entry[1]
+    
+    def finished(self, key, future):
+        
+        # runs when the solve itself finishes, so the answer is kept even if every client waiting on it went away
+        del self.in_flight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        
+        self.cache[key] = (time.monotonic(), future.result())
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+    
+    async def solve(self, query):
+        
+        self.stats['requests'] += 1
+        values = self.normalize(query)
+        key    = tuple(values[name] for name in service_defaults)
+        
+        summary = self.cached(key)
+        if summary is not None:
+            self.stats['cache_hits'] += 1
+            return dict(values, cached=True, coalesced=False, **summary)
+        
+        # the same query already being solved is waited on, not solved twice
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            summary = await asyncio.shield(future)
+            return dict(values, cached=False, coalesced=True, **summary)
+        
+        loop   = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, run_service_query, values)
+        future.add_done_callback(lambda future: self.finished(key, future))
+        self.in_flight[key] = future
+        self.stats['solves'] += 1
+        summary = await asyncio.shield(future)
+        
+        return dict(values, cached=False, coalesced=False, **summary)
+    
+    async def handle(self, reader, writer):
+        
+        # just enough HTTP/1.1 for GET /cruise?altitude=..., POST /cruise with a JSON body and GET /stats
+        try:
+            request_line       = (await reader.readline()).decode('latin-1').split()
+            method, target     = request_line[0], request_line[1]
+            headers            = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length             = int(headers.get('content-length', 0))
+            if length < 0:
+                raise ValueError('negative content-length')
+            if length > self.max_body:
+                raise Request_Too_Large('the body is limited to %d bytes' % self.max_body)
+            body               = await reader.readexactly(length)
+            
+            path, _, query_str = target.partition('?')
+            if path == '/stats':
+                status, payload = 200, dict(self.stats, cache_entries=len(self.cache), in_flight=len(self.in_flight), 
+                                            model=self.model)
+            elif path == '/cruise':
+                if method == 'POST':
+                    query = json.loads(body or b'{}')
+                    if not isinstance(query, dict):
+                        raise ValueError('the query has to be a JSON object')
+                else:
+                    query = dict(urllib.parse.parse_qsl(query_str, keep_blank_values=True))
+                status, payload = 200, await self.solve(query)
+            else:
+                status, payload = 404, {'error': 'unknown path ' + path}
+        
+        except Request_Too_Large as e:
+            status, payload = 413, {'error': str(e)}
+        except asyncio.IncompleteReadError:
+            status, payload = 400, {'error': 'the body is shorter than its content-length'}
+        except (ValueError, IndexError, KeyError) as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            self.stats['errors'] += 1
+            status, payload = 500, {'error': str(e)}
+        
+        data = json.dumps(payload).encode()
+        writer.write(('HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\nConnection: close\r\n\r\n' 
+                      % (status, {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large'}.get(status, 
+                                                                                                    'Internal Server Error'), 
+                         len(data))).encode() + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+    
+    async def serve(self, host='127.0.0.1', port=8180):
+        
+        self.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        print('Serving the Cherokee on http://%s:%d/cruise' % (host, port))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.shutdown()
+
+def serve(address='127.0.0.1:8180', max_workers=2, snapshot_path=service_snapshot):
+    
+    host, _, port = address.rpartition(':')
+    service       = Mission_Service(max_workers=max_workers, snapshot_path=snapshot_path)
+    try:
+        asyncio.run(service.serve(host or '127.0.0.1', int(port)))
+    except KeyboardInterrupt:
+        pass
+    
+    return
+
+
+# ----------------------------------------------------------------------
+#   Monte Carlo
+# ----------------------------------------------------------------------
+
+fuel_capacity         = 50. * Units.gallon # POH, both tanks
+monte_carlo_outputs   = ['fuel_burn', 'range', 'max_rpm']
+monte_carlo_quantiles = [5, 25, 50, 75, 95]
+
+def monte_carlo_distributions():
+    
+    # the estimates in vehicle_setup() and base_analysis(), as scipy.stats distributions over sweep parameters
+    from scipy import stats
+    
+    distributions                                 = OrderedDict()
+    distributions['power_specific_fuel_consumption'] = stats.uniform(0.43, 0.14)                   # lb/hp/h
+    distributions['gear_drag_factor']             = stats.uniform(1.1, 0.6)
+    distributions['fuselage_wetted_area']         = stats.uniform(17., 4.)                         # m^2, CompGeom says 17.8
+    distributions['takeoff_weight']               = stats.uniform(1950. * Units.pounds, 450. * Units.pounds)
+    
+    return distributions
+
+def monte_carlo_cases(distributions, number_of_samples, seed=None):
+    
+    # latin hypercube on the unit cube, then through each distribution's inverse cdf
+    from scipy.stats import qmc
+    
+    sample = qmc.LatinHypercube(d=len(distributions), seed=seed).random(number_of_samples)
+    values = [distribution.ppf(sample[:,i]) for i, distribution in enumerate(distributions.values())]
+    
+    return [dict(zip(distributions.keys(), map(float, case))) for case in zip(*values)]
+
+def run_monte_carlo_case(index, case):
+    
+    index, case, summary = run_sweep_case(index, case)
+    
+    # specific range off the cruise, times the fuel there is room for at this takeoff weight
+    if summary.get('converged'):
+        vehicle      = sweep_worker.vehicle
+        distance     = cruise_values({})['distance']
+        fuel         = min(fuel_capacity * avgas_density, 
+                           vehicle.mass_properties.takeoff - vehicle.mass_properties.max_zero_fuel)
+        summary.range = distance / summary.fuel_burn * fuel
+    
+    return index, case, summary
+
+def print_percentiles(done, values):
+    
+    line = '%6d cases' % done
+    for name in monte_carlo_outputs:
+        finite = np.asarray(values[name])
+        finite = finite[np.isfinite(finite)]
+        if finite.size:
+            line += '  | ' + name + ' ' + ' '.join('%.4g' % q for q in np.percentile(finite, monte_carlo_quantiles))
+    print(line)
+
+def run_monte_carlo(number_of_samples, distributions=None, seed=None, max_workers=None, store=None, 
+                    snapshot_path=None, report_every=100):
+    
+    if distributions is None:
+        distributions = monte_carlo_distributions()
+    cases  = monte_carlo_cases(distributions, number_of_samples, seed)
+    if store is None:
+        store = Column_Store()
+    values = {name: [] for name in monte_carlo_outputs}
+    
+    if snapshot_path is not None:
+        load_vehicle_and_analyses(snapshot_path)
+    
+    print('percentiles ' + str(monte_carlo_quantiles) + ' of ' + ', '.join(monte_carlo_outputs) + ' (SI units)')
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_sweep_worker, initargs=(snapshot_path,)) as executor:
+        futures = [executor.submit(run_monte_carlo_case, index, case) for index, case in enumerate(cases)]
+        
+        # the percentiles are updated as the samples come back, not just at the end
+        for done, future in enumerate(as_completed(futures), 1):
+            index, case, summary = future.result()
+            row = {'case': index}
+            row.update(case)
+            row.update(summary)
+            store.append(row)
+            for name in monte_carlo_outputs:
+                values[name].append(summary.get(name, np.nan))
+            if done % report_every == 0 or done == len(cases):
+                print_percentiles(done, values)
+    
+    return store
+
+
+# ----------------------------------------------------------------------
+#   Results Retention
+# ----------------------------------------------------------------------
+
+class Results_Retention:
+    
+    # whitelisted channels stay as compact arrays, every other array in the segment state is cut to its
+    # last row when the segment finalizes, which is all the next segment reads from its initials
+    def __init__(self, channels=None, dtype=np.float64):
+        self.channels = list(cruise_channels.keys()) if channels is None else list(channels)
+        self.dtype    = dtype
+    
+    def attach(self, mission):
+        
+        # attach after the mission is fully set up, the finalize process gets wrapped as a whole
+        for segment in mission.segments.values():
+            segment.process.finalize = self.retained_finalize(segment.process.finalize)
+        
+        return mission
+    
+    def retained_finalize(self, finalize):
+        
+        def retained(segment):
+            
+            # a pruned segment can not be post processed again, so a second finalize is a no-op
+            if segment.get('retained_bytes') is not None:
+                return
+            finalize(segment)
+            self.prune(segment)
+        
+        return retained
+    
+    def prune(self, segment):
+        
+        conditions = segment.state.conditions
+        kept       = {}
+        for name in self.channels:
+            path       = cruise_channels.get(name, name)
+            kept[path] = compact_arrays(get_condition(conditions, path), self.dtype)
+        
+        truncate_arrays(segment.state)
+        for path, value in kept.items():
+            set_condition(conditions, path, value)
+        
+        segment.retained_bytes = state_nbytes(segment.state)
+        
+        return segment
+
+def compact_arrays(value, dtype):
+    
+    # a whitelisted path can be a whole subtree, like the drag breakdown
+    if isinstance(value, dict):
+        return Data({key: compact_arrays(item, dtype) for key, item in value.items()})
+    if isinstance(value, np.ndarray):
+        return np.ascontiguousarray(value, dtype=dtype)
+    
+    return value
+
+def truncate_arrays(data, seen=None):
+    
+    # the initials are the previous segment's state, that one is pruned on its own
+    if seen is None:
+        seen = set()
+    seen.add(id(data))
+    
+    for key, value in data.items():
+        if key == 'initials' or id(value) in seen:
+            continue
+        if isinstance(value, np.ndarray):
+            if value.ndim and value.shape[0] > 1:
+                data[key] = value[-1:].copy()
+        elif isinstance(value, dict):
+            truncate_arrays(value, seen)
+    
+    return data
+
+def state_nbytes(data, seen=None):
+    
+    if seen is None:
+        seen = set()
+    seen.add(id(data))
+    
+    nbytes = 0
+    for key, value in data.items():
+        if key == 'initials' or id(value) in seen:
+            continue
+        if isinstance(value, np.ndarray):
+            nbytes += value.nbytes
+        elif isinstance(value, dict):
+            nbytes += state_nbytes(value, seen)
+    
+    return nbytes
+
+def retained_bytes(results):
+    return sum(segment.get('retained_bytes') or state_nbytes(segment.state) for segment in results.segments.values())
+
+
+# ----------------------------------------------------------------------
+#   Propeller Optimization
+# ----------------------------------------------------------------------
+
+# the design inputs vehicle_setup() hard codes, with the range each one is searched over
+prop_design_variables = OrderedDict([
+    ('design_Cl',             (0.3, 0.8)),
+    ('design_power_fraction', (0.55, 0.85)),
+    ('tip_radius',            (34. * Units.inches, 40. * Units.inches)),
+    ('angular_velocity',      (2300. * Units.rpm, 2700. * Units.rpm)),
+])
+max_tip_mach      = 0.85
+max_prop_diameter = 76. * Units.inches # the Sensenich fixed pitch prop the POH lists
+
+class Prop_Optimizer:
+    
+    # SLSQP on the variables scaled to [0, 1], every objective and gradient point is a sweep case,
+    # solved in the sweep pool and remembered so SLSQP asking for it again costs nothing
+    def __init__(self, variables=prop_design_variables, max_workers=None, snapshot_path=None, step=1e-3, 
+                 max_tip_mach=max_tip_mach, max_diameter=max_prop_diameter):
+        
+        self.variables     = variables
+        self.names         = list(variables.keys())
+        self.lower         = np.array([bounds[0] for bounds in variables.values()])
+        self.upper         = np.array([bounds[1] for bounds in variables.values()])
+        self.max_workers   = max_workers
+        self.snapshot_path = snapshot_path
+        self.step          = step
+        self.max_tip_mach  = max_tip_mach
+        self.max_diameter  = max_diameter
+        self.memo          = {}
+        self.executor      = None
+        self.scale         = 1.
+    
+    def physical(self, u):
+        return dict(zip(self.names, map(float, self.lower + np.asarray(u) * (self.upper - self.lower))))
+    
+    def key(self, u):
+        return tuple(np.round(np.asarray(u, dtype=float), 9))
+    
+    def evaluate(self, points):
+        
+        # only points never seen before go to the pool, and they all go at once
+        new     = OrderedDict((self.key(u), u) for u in points if self.key(u) not in self.memo)
+        futures = [self.executor.submit(run_sweep_case, index, self.physical(u)) for index, u in enumerate(new.values())]
+        for key, future in zip(new.keys(), futures):
+            index, case, summary = future.result()
+            
+            # a design that does not fly the cruise is made expensive rather than nan, SLSQP can not step around nan
+            if summary.get('converged'):
+                self.memo[key] = float(summary.fuel_burn)
+            else:
+                self.memo[key] = 10. * self.scale
+        
+        return [self.memo[self.key(u)] / self.scale for u in points]
+    
+    def fun(self, u):
+        return self.evaluate([u])[0]
+    
+    def jac(self, u):
+        
+        # forward differences, stepping backwards at an upper bound so no point leaves the box
+        u      = np.asarray(u, dtype=float)
+        steps  = np.where(u + self.step <= 1., self.step, -self.step)
+        points = [u] + [u + steps[i] * np.eye(len(u))[i] for i in range(len(u))]
+        values = self.evaluate(points)
+        
+        return (np.array(values[1:]) - values[0]) / steps
+    
+    def tip_mach_margin(self, u):
+        x = self.physical(u)
+        return self.max_tip_mach - np.hypot(x['angular_velocity'] * x['tip_radius'], self.design_speed) / self.speed_of_sound
+    
+    def diameter_margin(self, u):
+        return (self.max_diameter - 2. * self.physical(u)['tip_radius']) / self.max_diameter
+    
+    def optimize(self, maxiter=30, ftol=1e-6):
+        
+        from scipy.optimize import minimize
+        
+        # the tip Mach constraint is at the prop's design point
+        vehicle, analyses   = load_vehicle_and_analyses(self.snapshot_path)
+        prop                = cherokee_propeller(vehicle)
+        atmosphere          = SUAVE.Analyses.Atmospheric.US_Standard_1976()
+        self.speed_of_sound = float(atmosphere.compute_values(prop.design_altitude).speed_of_sound[0,0])
+        self.design_speed   = prop.freestream_velocity
+        
+        baseline = get_sweep_parameters(vehicle, analyses)
+        u0       = np.clip((np.array([baseline[name] for name in self.names]) - self.lower) / (self.upper - self.lower), 0., 1.)
+        
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_sweep_worker, 
+                                 initargs=(self.snapshot_path,)) as self.executor:
+            
+            # fuel burns go to SLSQP relative to the baseline design
+            self.fun(u0)
+            self.scale = self.memo[self.key(u0)]
+            
+            result = minimize(self.fun, u0, jac=self.jac, method='SLSQP', bounds=[(0., 1.)] * len(u0),
+                              constraints=[{'type': 'ineq', 'fun': self.tip_mach_margin},
+                                           {'type': 'ineq', 'fun': self.diameter_margin}],
+                              options={'maxiter': maxiter, 'ftol': ftol})
+        self.executor = None
+        
+        optimum                    = Data()
+        optimum.variables          = self.physical(result.x)
+        optimum.baseline_variables = self.physical(u0)
+        optimum.fuel_burn          = self.memo[self.key(result.x)]
+        optimum.baseline_fuel_burn = self.scale
+        optimum.tip_mach           = self.max_tip_mach - self.tip_mach_margin(result.x)
+        optimum.mission_solves     = len(self.memo)
+        optimum.success            = bool(result.success)
+        optimum.message            = str(result.message)
+        
+        print('prop optimization: ' + optimum.message)
+        print('fuel burn %.3f kg (baseline %.3f kg), tip Mach %.3f, %d mission solves' % (
+            optimum.fuel_burn, optimum.baseline_fuel_burn, optimum.tip_mach, optimum.mission_solves))
+        for name in self.names:
+            print('  %-22s %12.5g  (baseline %.5g)' % (name, optimum.variables[name], optimum.baseline_variables[name]))
+        
+        return optimum
+
+
+# ----------------------------------------------------------------------
+#   Payload Range
+# ----------------------------------------------------------------------
+
+def bracket_root(function, estimate, expansions=10, factor=2.):
+    
+    # a decreasing function with its root near the estimate, widened outward until the signs differ,
+    # every call is a mission solve so a bound whose sign is already known is not evaluated again
+    lower, upper, lower_known = 0.9 * estimate, 1.1 * estimate, False
+    for _ in range(expansions):
+        if function(upper) < 0.:
+            break
+        lower, upper, lower_known = upper, factor * upper, True
+    else:
+        raise ValueError('no sign change up to %g, the estimate was %g' % (lower, estimate))
+    
+    for _ in range(expansions):
+        if lower_known or function(lower) > 0.:
+            break
+        lower, upper = lower / factor, lower
+    else:
+        raise ValueError('no sign change down to %g, the estimate was %g' % (upper, estimate))
+    
+    return lower, upper
+
+def range_at_weight(vehicle, analyses, takeoff_weight, xtol=0.1 * Units.nautical_mile, number_control_points=16):
+    
+    # range to dry tanks in the mission_setup() cruise, the flight time is at that cruise speed and altitude,
+    # not at the best endurance speed
+    from scipy.optimize import brentq
+    
+    vehicle.mass_properties.takeoff = takeoff_weight
+    fuel  = min(fuel_capacity * avgas_density, takeoff_weight - vehicle.mass_properties.max_zero_fuel)
+    state = Data(unknowns=None, summary=None, solves=0)
+    
+    point                = Data()
+    point.takeoff_weight = takeoff_weight
+    point.fuel           = max(fuel, 0.)
+    point.payload        = takeoff_weight - vehicle.mass_properties.max_zero_fuel - point.fuel
+    
+    if fuel <= 0.:
+        point.update(range=0., flight_time=0., solves=0, converged=True)
+        return point
+    
+    # fuel left at the end of the cruise, every solve starts from the last converged one
+    def fuel_left(distance):
+        mission = mission_setup(analyses, vehicle, distance=distance, number_control_points=number_control_points)
+        segment = mission.segments.cruise
+        if state.unknowns is not None:
+            seed_unknowns(segment, state.unknowns)
+        state.summary = mission_summary(mission.evaluate())
+        state.solves += 1
+        if state.summary.converged:
+            state.unknowns = converged_unknowns(segment)
+        return fuel - state.summary.fuel_burn
+    
+    # burn is close to proportional to distance, so one solve nearly brackets the root
+    guess        = cruise_values({})['distance']
+    lower, upper = bracket_root(fuel_left, guess * fuel / (fuel - fuel_left(guess)))
+    
+    distance = brentq(fuel_left, lower, upper, xtol=xtol)
+    fuel_left(distance)
+    
+    point.range       = distance
+    point.flight_time = state.summary.flight_time
+    point.solves      = state.solves
+    point.converged   = bool(state.summary.converged)
+    
+    return point
+
+def run_range_case(index, takeoff_weight):
+    
+    try:
+        apply_sweep_case(sweep_worker.vehicle, sweep_worker.analyses, {'takeoff_weight': takeoff_weight})
+        point = range_at_weight(sweep_worker.vehicle, sweep_worker.analyses, takeoff_weight)
+    except Exception as e:
+        print('Range case ' + str(index) + ' failed: ' + str(e))
+        point = Data(takeoff_weight = takeoff_weight, converged = False)
+    
+    return index, point
+
+def payload_range(number_of_points=12, max_workers=None, snapshot_path=None, store=None):
+    
+    vehicle, analyses = load_vehicle_and_analyses(snapshot_path)
+    zero_fuel         = vehicle.mass_properties.max_zero_fuel
+    max_takeoff       = vehicle.mass_properties.max_takeoff
+    
+    # the corner where the tanks are full goes in as its own point
+    weights = np.linspace(zero_fuel, max_takeoff, number_of_points)
+    full    = zero_fuel + fuel_capacity * avgas_density
+    if full < max_takeoff:
+        weights = np.union1d(weights, [full])
+    
+    if store is None:
+        store = Column_Store()
+    
+    # each weight is its own root find, so the weights go across the pool
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_sweep_worker, initargs=(snapshot_path,)) as executor:
+        futures = [executor.submit(run_range_case, index, weight) for index, weight in enumerate(weights)]
+        points  = dict(future.result() for future in as_completed(futures))
+    
+    # the time column is how long the fuel lasts at the cruise speed, a best endurance speed would stay up longer
+    cruise = cruise_values({})
+    print('cruise at %.0f kt and %.0f ft to dry tanks, no reserve' % (cruise['air_speed'] / Units.knots, 
+                                                                       cruise['altitude'] / Units.feet))
+    print('%10s %10s %10s %10s %10s' % ('TOW lb', 'fuel lb', 'payload lb', 'range nmi', 'time h'))
+    for index in range(len(weights)):
+        point = points[index]
+        row   = {'case': index}
+        row.update(point)
+        store.append(row)
+        print('%10.0f %10.1f %10.1f %10.1f %10.2f%s' % (point.takeoff_weight / Units.pounds, point.get('fuel', np.nan) / Units.pounds,
+              point.get('payload', np.nan) / Units.pounds, point.get('range', np.nan) / Units.nautical_mile,
+              point.get('flight_time', np.nan) / Units.hour, '' if point.converged else '  (not converged)'))
+    
+    return store
+
+
+# ----------------------------------------------------------------------
+#   Golden Results
+# ----------------------------------------------------------------------
+
+golden_format_version = 1
+
+# the cruise channels every optimization has to leave alone, the whole drag breakdown goes in as well
+golden_channels = ['throttle', 'rpm', 'lift_coefficient', 'drag_coefficient', 'mass']
+
+# goldens are written by the direct method, every other mode is a fast path checked against them
+golden_modes             = ['direct', 'surrogate', 'polar_tables', 'batch', 'lean']
+golden_retained_channels = golden_channels + ['aerodynamics.drag_breakdown']
+
+# a small grid by default, any list of sweep cases works
+golden_case_grid = {'takeoff_weight' : [2000. * Units.pounds, 2200. * Units.pounds, 2400. * Units.pounds],
+                    'design_Cl'      : [0.5, 0.6, 0.7]}
+
+def golden_columns(results):
+    
+    columns = {}
+    for name in golden_channels:
+        columns[name] = results_channel(results, name)
+    
+    # breakdown paths can differ between segments, so they go through the same nan filling as results_columns
+    segments = [(segment.state.numerics.number_control_points, 
+                 flatten_conditions(segment.state.conditions.aerodynamics.drag_breakdown, 
+                                    segment.state.numerics.number_control_points, 'drag_breakdown.'))
+                for segment in results.segments.values()]
+    for name in sorted(set().union(*[breakdown.keys() for n_points, breakdown in segments])):
+        columns[name] = np.concatenate([np.asarray(breakdown.get(name, np.full(n_points, np.nan)), dtype=np.float64)
+                                        for n_points, breakdown in segments])
+    
+    return columns
+
+def run_golden_case(index, case, mode='direct'):
+    
+    try:
+        vehicle  = sweep_worker.vehicle
+        analyses = sweep_worker.analyses
+        apply_sweep_case(vehicle, analyses, case)
+        
+        # the tabulated modes were set up by the worker, batch and lean change how the same cruise is solved and kept
+        if mode == 'batch':
+            cruise  = cruise_values({})
+            mission = batch_cruise_mission(analyses, vehicle, cruise['altitude'], cruise['air_speed'], 
+                                           cruise['distance'], cruise['rpm'])
+        else:
+            mission = mission_setup(analyses, vehicle)
+            if mode == 'lean':
+                Results_Retention(golden_retained_channels).attach(mission)
+        columns = golden_columns(mission.evaluate())
+    except Exception as e:
+        print('Golden case ' + str(index) + ' failed: ' + str(e))
+        columns = None
+    
+    return index, columns
+
+def run_golden_cases(cases, max_workers=None, snapshot_path=None, mode='direct'):
+    
+    if mode not in golden_modes:
+        raise ValueError('unknown golden mode: ' + str(mode))
+    if snapshot_path is not None:
+        load_vehicle_and_analyses(snapshot_path)
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_sweep_worker, initargs=(snapshot_path, mode)) as executor:
+        futures = [executor.submit(run_golden_case, index, case, mode) for index, case in enumerate(cases)]
+        for future in as_completed(futures):
+            yield future.result()
+
+def write_golden(path, cases=None, max_workers=None, snapshot_path=None):
+    
+    cases = sweep_cases(golden_case_grid if cases is None else cases)
+    os.makedirs(path, exist_ok=True)
+    
+    # one columns folder per case, so a check memory maps only what it compares
+    failed = []
+    for index, columns in run_golden_cases(cases, max_workers, snapshot_path):
+        if columns is None:
+            failed.append(index)
+            continue
+        write_columns(os.path.join(path, 'case_' + str(index)), columns)
+    
+    with open(os.path.join(path, 'cases.json'), 'w') as f:
+        json.dump({'format_version': golden_format_version, 'suave_version': SUAVE.__version__, 'mode': 'direct',
+                   'cases': cases, 'failed': failed}, f, indent=1)
+    
+    print('golden results for %d cases written to %s' % (len(cases) - len(failed), path))
+    
+    return path
+
+def compare_column(name, value, golden, rtol, atol):
+    
+    value  = np.asarray(value)
+    golden = np.asarray(golden)
+    if value.shape != golden.shape:
+        return {'column': name, 'problem': 'shape %s, golden %s' % (value.shape, golden.shape)}
+    if value.dtype.kind not in 'fiu':
+        return None if np.array_equal(value, golden) else {'column': name, 'problem': 'values differ'}
+    
+    # same test as np.isclose, a nan only matches a nan
+    error = np.abs(value - golden)
+    bad   = ~((error <= atol + rtol * np.abs(golden)) | (np.isnan(value) & np.isnan(golden)))
+    if not np.any(bad):
+        return None
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative = np.where(golden != 0., error / np.abs(golden), np.inf)
+    
+    return {'column': name, 'points': int(np.sum(bad)), 'max_abs': float(np.nanmax(np.where(bad, error, np.nan))), 
+            'max_rel': float(np.nanmax(np.where(bad, relative, np.nan)))}
+
+def check_golden(path, rtol=1e-6, atol=1e-10, max_workers=None, snapshot_path=None, report_path=None, worst=20, mode='direct'):
+    
+    with open(os.path.join(path, 'cases.json')) as f:
+        manifest = json.load(f)
+    cases = manifest['cases']
+    
+    differences = []
+    
+    # cases that had no golden columns are still run, but only a failure to run is reported for them
+    failed = []
+    for index, columns in run_golden_cases(cases, max_workers, snapshot_path, mode):
+        folder = os.path.join(path, 'case_' + str(index))
+        if columns is None:
+            failed.append(index)
+            continue
+        if not os.path.isdir(folder):
+            continue
+        
+        names = list_results_columns(folder)
+        for name in sorted(set(names) | set(columns)):
+            if name not in names or name not in columns:
+                differences.append({'case': index, 'column': name, 
+                                    'problem': 'missing from the ' + ('golden results' if name not in names else 'new run')})
+                continue
+            difference = compare_column(name, columns[name], load_results_column(folder, name), rtol, atol)
+            if difference is not None:
+                differences.append(dict(difference, case=index))
+    
+    report = {'mode': mode, 'cases': len(cases), 'rtol': rtol, 'atol': atol, 'failed_runs': sorted(failed), 
+              'differences': len(differences), 'passed': not differences and not failed,
+              'worst': sorted(differences, key=lambda d: -d.get('max_rel', np.inf))[:worst]}
+    
+    print('golden check, %s mode: %d cases, %d failed runs, %d differing columns (rtol %g, atol %g)' % (
+          mode, len(cases), len(failed), len(differences), rtol, atol))
+    for difference in report['worst']:
+        if 'problem' in difference:
+            print('  case %-10s %-60s %s' % (difference['case'], difference['column'], difference['problem']))
+        else:
+            print('  case %-10s %-60s %4d points  max abs %.3e  max rel %.3e' % (difference['case'], difference['column'], 
+                  difference['points'], difference['max_abs'], difference['max_rel']))
+    
+    if report_path is not None:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=1)
+    
+    return report
+
+
+# ----------------------------------------------------------------------
+#   Benchmarks
+# ----------------------------------------------------------------------
+
+benchmark_control_points = (8, 16, 32, 64)
+benchmark_thresholds     = {'time': 1.25, 'peak_memory': 1.25} #slower or bigger than this times the baseline is a regression
+benchmark_repeats        = 5
+
+# fresh interpreters every time, that is what a new sweep worker pays
+startup_code = {'headless' : 'import runpy; runpy.run_path({0!r}, run_name="cherokee")',
+                'full'     : 'import runpy; g = runpy.run_path({0!r}, run_name="cherokee"); g["load_vsp"](); '
+                             'import matplotlib.pyplot, SUAVE.Plots.Performance, SUAVE.Plots.Geometry'}
+
+def cold_start_time(mode, repeats=5):
+    
+    script  = os.path.abspath(__file__)
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', startup_code[mode].format(script)], check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    
+    return float(np.median(samples))
+
+def benchmark_startup(repeats=5):
+    
+    times = {}
+    for mode in startup_code.keys():
+        times[mode] = cold_start_time(mode, repeats)
+        print('%-9s startup: %.3f s (median of %d)' % (mode, times[mode], repeats))
+    
+    print('headless saves %.3f s per process' % (times['full'] - times['headless']))
+    
+    return times
+
+def time_stage(stages, stage, function, repeats=benchmark_repeats):
+    
+    # timed with tracemalloc off, its hooks slow every allocation and numpy heavy stages the most
+    samples = []
+    for i in range(repeats):
+        start   = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    elapsed = float(np.median(samples))
+    
+    # then one more run only for the memory, peak is what the stage allocated on top of what was already there
+    tracemalloc.start()
+    result  = function()
+    peak    = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    stages[stage] = {'time': elapsed, 'peak_memory': peak}
+    print('%-28s %9.3f s %10.1f MB  (median of %d)' % (stage, elapsed, peak / 2.**20, repeats))
+    
+    return result
+
+def run_benchmarks(control_points=benchmark_control_points, path=None):
+    
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
+    stages = {}
+    stages['import'] = {'time': cold_start_time('headless'), 'peak_memory': 0}
+    
+    # every stage runs several times, so each run gets fresh inputs where a stage changes what it is given
+    vehicle  = time_stage(stages, 'vehicle_setup', vehicle_setup)
+    
+    # the design on its own, straight through SUAVE and past the cache
+    engine   = cherokee_engine(vehicle)
+    time_stage(stages, 'propeller_design', lambda: propeller_design(prop_setup(engine)))
+    
+    # the blade section lookups the BEMT does every iteration, 100 calls each, spline surrogate against the polar table
+    prop     = cherokee_propeller(vehicle)
+    geometry = prop.airfoil_geometry[0]
+    spline   = prop.airfoil_cl_surrogates[geometry]
+    table    = Polar_Surrogate(load_polar_table(prop.airfoil_polars[0]), 'cl', spline)
+    re, a    = blade_section_grid(prop)
+    time_stage(stages, 'airfoil_cl[spline]', lambda: [spline(re, a, grid=False) for k in range(100)])
+    time_stage(stages, 'airfoil_cl[polar_table]', lambda: [table(re, a) for k in range(100)])
+    
+    analyses = time_stage(stages, 'base_analysis', lambda: base_analysis(vehicle))
+    time_stage(stages, 'analyses.finalize', analyses.finalize)
+    
+    for n in control_points:
+        time_stage(stages, 'mission_setup[' + str(n) + ']', lambda: mission_setup(analyses, vehicle, number_control_points=n))
+        missions = iter([mission_setup(analyses, vehicle, number_control_points=n) for i in range(benchmark_repeats + 1)])
+        results  = time_stage(stages, 'mission.evaluate[' + str(n) + ']', lambda: next(missions).evaluate())
+    
+    def plot_and_close():
+        plot_mission(results)
+        plt.close('all')
+    time_stage(stages, 'plot_mission', plot_and_close)
+    
+    benchmark = {'suave_version' : SUAVE.__version__,
+                 'python'        : sys.version.split()[0],
+                 'thresholds'    : benchmark_thresholds,
+                 'stages'        : stages}
+    
+    if path is not None:
+        with open(path, 'w') as f:
+            json.dump(benchmark, f, indent=1)
+    
+    return benchmark
+
+def compare_benchmarks(benchmark, baseline):
+    
+    # the baseline file carries the thresholds it should be held to
+    thresholds  = baseline.get('thresholds', benchmark_thresholds)
+    regressions = []
+    for stage, old in baseline['stages'].items():
+        new = benchmark['stages'].get(stage)
+        if new is None:
+            continue
+        for metric, limit in thresholds.items():
+            if old[metric] > 0 and new[metric] > limit * old[metric]:
+                regressions.append((stage, metric, old[metric], new[metric]))
+                print('REGRESSION %-28s %-12s %.4g -> %.4g (x%.2f)' % (stage, metric, old[metric], new[metric], 
+                                                                       new[metric] / old[metric]))
+    
+    return regressions
+
 
 # This section is needed to actually run the various functions in the file
 if __name__ == '__main__': 
-    main()      
-
-    plt.show()
+    parser = argparse.ArgumentParser(description='Piper Cherokee 180 SUAVE model')
+    parser.add_argument('--headless', action='store_true', help='skip OpenVSP, geometry rendering and plotting')
+    parser.add_argument('--results', default=None, help='export the mission results to this folder, or to one file if it ends in .parquet')
+    parser.add_argument('--trace', default=None, help='trace every solver iteration and write the JSON here')
+    parser.add_argument('--plots', default=None, help='write the mission plots to this folder instead of showing them')
+    parser.add_argument('--polar-tables', action='store_true', help='run the prop on the tabulated xfoil polars, reports how far they are from the splines')
+    parser.add_argument('--aero-surrogate', action='store_true', help='take the aerodynamics from the Fidelity_Zero table, prints its error bound')
+    parser.add_argument('--flight-plan', action='store_true', help='fly the climb, cruise and descent instead of the cruise alone')
+    parser.add_argument('--poh-chart', default=None, nargs='?', const='', help='build the POH power setting chart, optionally saving its columns here')
+    parser.add_argument('--serve', default=None, nargs='?', const='127.0.0.1:8180', help='answer cruise queries over HTTP on host:port')
+    parser.add_argument('--workers', default=2, type=int, help='mission solves the service runs at once')
+    parser.add_argument('--monte-carlo', default=None, type=int, help='sample the uncertain inputs this many times')
+    parser.add_argument('--seed', default=None, type=int, help='fixed seed for a reproducible Monte Carlo')
+    parser.add_argument('--optimize-prop', action='store_true', help='optimize the prop design inputs for cruise fuel burn')
+    parser.add_argument('--payload-range', default=None, nargs='?', const='', help='build the payload-range diagram with the flight time at cruise speed, optionally saving its columns here')
+    parser.add_argument('--golden-write', default=None, help='solve the golden cases and store their columns in this folder')
+    parser.add_argument('--golden-check', default=None, help='re-solve the golden cases in this folder and diff them, exits 1 on a difference')
+    parser.add_argument('--golden-mode', default='direct', choices=golden_modes, help='solve path --golden-check runs the cases through')
+    parser.add_argument('--rtol', default=1e-6, type=float, help='relative tolerance for --golden-check')
+    parser.add_argument('--atol', default=1e-10, type=float, help='absolute tolerance for --golden-check')
+    parser.add_argument('--poh-max-rpm-deviation', default=poh_max_rpm_deviation, type=float, help='largest RPM deviation from the POH --poh-chart accepts, exits 1 past it')
+    parser.add_argument('--continuation', default=None, nargs='?', const='', help='solve the cruise grid warm started against cold, optionally saving the evaluation counts here')
+    parser.add_argument('--tolerance', default=None, type=float, help='pick the cruise control points for this fuel/time tolerance')
+    parser.add_argument('--benchmark-startup', action='store_true', help='time a cold start, headless against full')
+    parser.add_argument('--benchmark', default=None, help='time every pipeline stage and write the JSON here')
+    parser.add_argument('--benchmark-baseline', default=None, help='baseline JSON to check the benchmark against')
+    args = parser.parse_args()
+    if args.tolerance is not None and args.flight_plan:
+        parser.error('--tolerance picks the control points of the cruise alone, it can not be combined with --flight-plan')
+    
+    if args.serve:
+        serve(args.serve, args.workers)
+    elif args.monte_carlo:
+        store = run_monte_carlo(args.monte_carlo, seed=args.seed, max_workers=args.workers)
+        if args.results:
+            store.save(args.results)
+    elif args.optimize_prop:
+        Prop_Optimizer(max_workers=args.workers).optimize()
+    elif args.payload_range is not None:
+        store = payload_range(max_workers=args.workers)
+        if args.payload_range:
+            store.save(args.payload_range)
+    elif args.golden_write:
+        write_golden(args.golden_write, max_workers=args.workers)
+    elif args.golden_check:
+        report = check_golden(args.golden_check, args.rtol, args.atol, max_workers=args.workers, mode=args.golden_mode)
+        sys.exit(0 if report['passed'] else 1)
+    elif args.benchmark_startup:
+        benchmark_startup()
+    elif args.benchmark:
+        benchmark = run_benchmarks(path=args.benchmark)
+        if args.benchmark_baseline:
+            with open(args.benchmark_baseline) as f:
+                regressions = compare_benchmarks(benchmark, json.load(f))
+            sys.exit(1 if regressions else 0)
+    elif args.continuation is not None:
+        vehicle  = vehicle_setup()
+        analyses = base_analysis(vehicle)
+        analyses.finalize()
+        results, report = solve_with_continuation(analyses, vehicle, continuation_grid(), compare_cold_start=True)
+        if args.continuation:
+            report.save(args.continuation)
+    elif args.poh_chart is not None:
+        vehicle  = vehicle_setup()
+        analyses = base_analysis(vehicle)
+        analyses.finalize()
+        chart    = poh_power_chart(analyses, vehicle)
+        print_poh_chart(chart)
+        if args.poh_chart:
+            write_columns(args.poh_chart, poh_chart_columns(chart))
+        sys.exit(0 if check_poh_chart(chart, args.poh_max_rpm_deviation) else 1)
+    else:
+        main(headless=args.headless, results_path=args.results, trace_path=args.trace, tolerance=args.tolerance, flight_plan=args.flight_plan, plots_path=args.plots, 
+             polar_tables=args.polar_tables, aero_surrogate=args.aero_surrogate)
+        
+        if not args.headless and args.plots is None:
+            import matplotlib.pyplot as plt
+            plt.show()
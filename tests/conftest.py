@@ -0,0 +1,36 @@
+import os
+import sys
+import importlib.util
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def cherokee():
+    
+    # the model is a script with a space in its name, and it reads its airfoils relative to the repo root
+    pytest.importorskip('numpy')
+    pytest.importorskip('SUAVE')
+    
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    spec   = importlib.util.spec_from_file_location('cherokee', os.path.join(ROOT, 'Piper Cherokee 180.py'))
+    module = importlib.util.module_from_spec(spec)
+    
+    # registered so the process pool can pickle the sweep workers by module name
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    yield module
+    os.chdir(cwd)
+
+
+@pytest.fixture(scope='session')
+def model(cherokee):
+    
+    vehicle  = cherokee.vehicle_setup()
+    analyses = cherokee.base_analysis(vehicle)
+    analyses.finalize()
+    
+    return vehicle, analyses
@@ -0,0 +1,42 @@
+import pytest
+
+
+def test_chosen_level_meets_the_tolerance(cherokee, model):
+    
+    vehicle, analyses = model
+    tolerance = 1e-3
+    adaptive  = cherokee.adaptive_cruise(analyses, vehicle, tolerance, levels=(4, 6, 8, 12, 16))
+    
+    assert adaptive.converged
+    assert adaptive.error <= tolerance
+    assert adaptive.results.segments.cruise.state.numerics.converged
+    
+    # against a much finer solve, not just the level before it
+    reference = cherokee.mission_summary(cherokee.mission_setup(analyses, vehicle, number_control_points=32).evaluate())
+    assert adaptive.fuel_burn == pytest.approx(reference.fuel_burn, rel=tolerance)
+    assert adaptive.flight_time == pytest.approx(reference.flight_time, rel=tolerance)
+
+
+def test_unconverged_levels_are_skipped(cherokee, model, monkeypatch):
+    
+    vehicle, analyses = model
+    mission_setup     = cherokee.mission_setup
+    
+    # the 6 point level gives up straight away, as if the root finder had stalled
+    def stalled(fun, x0, args=(), **kwargs):
+        x, info, ier, msg = cherokee.fsolve(fun, x0, args=args, **kwargs)
+        return x, info, 5, 'stalled'
+    
+    def setup(analyses, vehicle, number_control_points=16, **cruise):
+        mission = mission_setup(analyses, vehicle, number_control_points=number_control_points, **cruise)
+        if number_control_points == 6:
+            mission.segments.cruise.settings.root_finder = stalled
+        return mission
+    
+    monkeypatch.setattr(cherokee, 'mission_setup', setup)
+    adaptive = cherokee.adaptive_cruise(analyses, vehicle, 1e-12, levels=(4, 6))
+    
+    # the stalled level is neither chosen nor compared against, so there is no error estimate yet
+    assert adaptive.number_control_points == 4
+    assert not adaptive.converged
+    assert adaptive.results.segments.cruise.state.numerics.converged
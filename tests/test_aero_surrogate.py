@@ -0,0 +1,62 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def surrogate(cherokee):
+    
+    # its own vehicle, the tests move the airframe under it; a coarse table keeps the build short
+    vehicle      = cherokee.vehicle_setup()
+    aerodynamics = cherokee.SUAVE.Analyses.Aerodynamics.Fidelity_Zero()
+    aerodynamics.geometry                            = vehicle
+    aerodynamics.settings.drag_coefficient_increment = cherokee.landing_gear_drag_area() / vehicle.reference_area
+    
+    surrogate                   = cherokee.aerodynamics_surrogate(aerodynamics)
+    surrogate.angle_of_attack   = np.linspace(-4., 12., 5) * cherokee.Units.deg
+    surrogate.mach              = np.linspace(0.1, 0.25, 4)
+    surrogate.altitude          = np.linspace(0., 10000., 3) * cherokee.Units.feet
+    surrogate.validation_points = 8
+    surrogate.finalize()
+    
+    return surrogate
+
+
+def cruise_state(cherokee):
+    
+    SUAVE = cherokee.SUAVE
+    state = SUAVE.Analyses.Mission.Segments.Conditions.State()
+    state.conditions.update(SUAVE.Analyses.Mission.Segments.Conditions.Aerodynamics())
+    state.expand_rows(3)
+    state.conditions.aerodynamics.angle_of_attack = np.array([[1.], [2.], [3.]]) * cherokee.Units.deg
+    state.conditions.freestream.mach_number       = np.full((3, 1), 0.17)
+    state.conditions.freestream.altitude          = np.full((3, 1), 8000. * cherokee.Units.feet)
+    
+    return state
+
+
+def test_increment_moves_the_total_and_the_breakdown(cherokee, surrogate):
+    
+    state  = cruise_state(cherokee)
+    before = surrogate.evaluate(state).drag.total.copy()
+    total  = state.conditions.aerodynamics.drag_breakdown.total.copy()
+    
+    surrogate.settings.drag_coefficient_increment += 0.002
+    state = cruise_state(cherokee)
+    after = surrogate.evaluate(state).drag.total
+    
+    assert after - before == pytest.approx(np.full((3, 1), 0.002))
+    assert state.conditions.aerodynamics.drag_breakdown.total - total == pytest.approx(np.full((3, 1), 0.002))
+
+
+def test_changed_airframe_rebuilds_the_table(cherokee, surrogate):
+    
+    built  = surrogate.built_inputs
+    before = surrogate.evaluate(cruise_state(cherokee)).drag.total.copy()
+    
+    # more wetted area is more skin friction, the old table would not see it
+    surrogate.geometry.fuselages.fuselage.areas.wetted *= 1.5
+    after = surrogate.evaluate(cruise_state(cherokee)).drag.total
+    
+    assert surrogate.built_inputs != built
+    assert np.all(after > before)
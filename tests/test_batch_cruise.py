@@ -0,0 +1,48 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+# mixed altitudes, speeds and distances so every case has its own time scaling
+altitudes  = [4000., 9000., 7000.]
+air_speeds = [100., 116., 110.]
+distances  = [50., 100., 80.]
+
+
+def case_values(Units):
+    return (np.array(altitudes) * Units.feet, np.array(air_speeds) * Units.knots, 
+            np.array(distances) * Units.nautical_mile)
+
+
+def test_batch_matches_single_missions(cherokee, model):
+    
+    vehicle, analyses = model
+    alt, speed, dist  = case_values(cherokee.Units)
+    
+    # two cases per batch, so the chunking is covered too
+    batch = cherokee.evaluate_cruise_batch(analyses, vehicle, alt, speed, dist, 2600., 
+                                           number_control_points=8, cases_per_batch=2)
+    assert batch.converged.all()
+    
+    for k in range(len(alt)):
+        mission = cherokee.mission_setup(analyses, vehicle, altitude=alt[k], air_speed=speed[k], distance=dist[k], 
+                                         rpm=2600, number_control_points=8)
+        results = mission.evaluate()
+        
+        np.testing.assert_allclose(batch.rpm[k], cherokee.results_channel(results, 'rpm'), rtol=1e-4)
+        np.testing.assert_allclose(batch.throttle[k], cherokee.results_channel(results, 'throttle'), rtol=1e-4)
+        np.testing.assert_allclose(batch.fuel_burn[k], cherokee.mission_summary(results).fuel_burn, rtol=1e-4)
+
+
+def test_unconverged_case_is_reported(cherokee, model):
+    
+    vehicle, analyses = model
+    alt, speed, dist  = case_values(cherokee.Units)
+    
+    # one newton step from the default guess is never enough
+    mission = cherokee.batch_cruise_mission(analyses, vehicle, alt, speed, dist, 2600., number_control_points=8)
+    mission.segments.batch_cruise.batch.max_iterations = 1
+    results = mission.evaluate()
+    
+    batch = cherokee.unstack_cruise_batch(results.segments.batch_cruise)
+    assert batch.converged.shape == (len(alt),)
+    assert not batch.converged.all()
@@ -0,0 +1,22 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+def test_warm_starts_take_fewer_evaluations(cherokee, model):
+    
+    vehicle, analyses = model
+    variants = cherokee.continuation_grid(altitudes=[8000., 8500.], air_speeds=[110., 112., 114.])
+    
+    results, report = cherokee.solve_with_continuation(analyses, vehicle, variants, number_control_points=4,
+                                                       compare_cold_start=True)
+    columns = report.arrays()
+    warm    = columns['function_evaluations']
+    cold    = columns['cold_function_evaluations']
+    
+    assert len(results) == len(variants)
+    assert np.all(columns['converged'])
+    
+    # the first case has nothing to start from, every later one sits next to a solved case
+    assert warm[0] == cold[0]
+    assert np.sum(warm[1:]) < np.sum(cold[1:])
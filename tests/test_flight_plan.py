@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def flight_plan(cherokee, monkeypatch):
+    
+    # an empty cache per test, on a vehicle of its own since the tests change its mass
+    monkeypatch.setattr(cherokee, 'solved_segments', cherokee.OrderedDict())
+    monkeypatch.setattr(cherokee, 'segment_cache', cherokee.OrderedDict())
+    
+    vehicle  = cherokee.vehicle_setup()
+    analyses = cherokee.flight_plan_analysis(vehicle)
+    
+    def solve(specs=cherokee.default_flight_plan):
+        mission = cherokee.mission_from_specs(analyses, vehicle, specs, number_control_points=4)
+        results = mission.evaluate()
+        return mission, cherokee.mission_summary(results)
+    
+    return vehicle, solve
+
+
+def test_identical_flight_plan_is_copied(cherokee, flight_plan):
+    
+    vehicle, solve = flight_plan
+    first, summary = solve()
+    again, repeat  = solve()
+    
+    assert not any(segment.reused for segment in first.segments.values())
+    assert all(segment.reused for segment in again.segments.values())
+    assert repeat.fuel_burn == summary.fuel_burn
+    assert repeat.flight_time == summary.flight_time
+
+
+def test_changed_start_or_model_is_solved_again(cherokee, flight_plan):
+    
+    vehicle, solve = flight_plan
+    Units          = cherokee.Units
+    cruise         = dict(cherokee.default_flight_plan[1])
+    longer         = dict(cruise, distance=150. * Units.nautical_mile)
+    descent        = cherokee.default_flight_plan[2]
+    
+    # the same climb and cruise, then a longer leg: only the first two are copied, and the descent starts later
+    solve([cherokee.default_flight_plan[0], cruise, cruise, descent])
+    mission, summary = solve([cherokee.default_flight_plan[0], cruise, longer, descent])
+    assert [segment.reused for segment in mission.segments.values()] == [True, True, False, False]
+    
+    # a heavier airplane is a different model, nothing is copied
+    vehicle.mass_properties.takeoff += 100. * Units.lb
+    mission, heavier = solve([cherokee.default_flight_plan[0], cruise, longer, descent])
+    assert not any(segment.reused for segment in mission.segments.values())
+    assert heavier.fuel_burn > summary.fuel_burn
@@ -0,0 +1,38 @@
+import pytest
+
+
+@pytest.mark.parametrize('estimate', [10., 90., 100., 110., 900.])
+def test_bracket_straddles_the_root(cherokee, estimate):
+    
+    # fuel left falls off linearly with distance, dry at 100, wherever the first guess lands
+    calls     = []
+    fuel_left = lambda distance: calls.append(distance) or 100. - distance
+    
+    lower, upper = cherokee.bracket_root(fuel_left, estimate)
+    
+    # a few solves even a factor of ten off, and never the same distance twice
+    assert len(calls) <= 6
+    assert len(set(calls)) == len(calls)
+    assert fuel_left(lower) > 0. > fuel_left(upper)
+
+
+def test_bracket_gives_up_without_a_sign_change(cherokee):
+    
+    with pytest.raises(ValueError):
+        cherokee.bracket_root(lambda distance: 1., 100.)
+
+
+def test_range_burns_exactly_the_fuel_on_board(cherokee, model):
+    
+    vehicle, analyses = model
+    takeoff = vehicle.mass_properties.takeoff
+    try:
+        point = cherokee.range_at_weight(vehicle, analyses, takeoff, number_control_points=4)
+    finally:
+        vehicle.mass_properties.takeoff = takeoff
+    
+    assert point.converged
+    mission = cherokee.mission_setup(analyses, vehicle, distance=point.range, number_control_points=4)
+    summary = cherokee.mission_summary(mission.evaluate())
+    assert summary.fuel_burn == pytest.approx(point.fuel, rel=1e-3)
+    assert summary.flight_time == pytest.approx(point.flight_time, rel=1e-3)
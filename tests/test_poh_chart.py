@@ -0,0 +1,22 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+def test_power_setting_fixture(cherokee):
+    
+    # spot checks against page 42 of Piper_PA-28-180E.pdf
+    table = cherokee.read_poh_table()
+    assert cherokee.poh_percent_powers(table) == [75, 70, 65, 60]
+    assert len(table['pressure_altitude_ft']) == 13
+    assert table['rpm_75'][0] == 2500
+    assert table['rpm_60'][-1] == 2530
+    assert np.isnan(table['rpm_75'][8])
+    assert np.isnan(table['rpm_65'][12])
+
+
+def test_model_rpm_within_poh_tolerance(cherokee, model):
+    
+    vehicle, analyses = model
+    chart = cherokee.poh_power_chart(analyses, vehicle)
+    assert cherokee.check_poh_chart(chart)
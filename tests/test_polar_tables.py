@@ -0,0 +1,37 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+polar_files = ['./Airfoils/Polars/NACA_4412_polar_Re_50000.txt',
+               './Airfoils/Polars/NACA_4412_polar_Re_100000.txt',
+               './Airfoils/Polars/NACA_4412_polar_Re_200000.txt',
+               './Airfoils/Polars/NACA_4412_polar_Re_500000.txt',
+               './Airfoils/Polars/NACA_4412_polar_Re_1000000.txt']
+
+
+def test_table_falls_back_outside_the_xfoil_data(cherokee):
+    
+    Units    = cherokee.Units
+    polar    = cherokee.build_polar_table(polar_files)
+    fallback = lambda reynolds, alpha, grid=False: np.full(np.shape(alpha), -99.)
+    cl       = cherokee.Polar_Surrogate(polar, 'cl', fallback)
+    
+    reynolds = np.array([2e5, 2e5, 2e5])
+    alpha    = np.array([2., 30., -30.]) * Units.deg
+    values   = cl(reynolds, alpha)
+    
+    # inside the data it is the table, past stall it is whatever the table replaced
+    assert values[0] == pytest.approx(polar.lookup(polar.cl, alpha[0], reynolds[0]))
+    assert values[1] == -99.
+    assert values[2] == -99.
+
+
+def test_shared_bracket_matches_separate_lookups(cherokee):
+    
+    polar    = cherokee.build_polar_table(polar_files)
+    reynolds = np.geomspace(3e4, 2e6, 7)[:,None] * np.ones((1, 9))
+    alpha    = np.linspace(-20., 25., 9)[None,:] * cherokee.Units.deg * np.ones((7, 1))
+    bracket  = polar.bracket(alpha, reynolds)
+    
+    assert np.array_equal(polar.lookup(polar.cd, alpha, reynolds, bracket), polar.lookup(polar.cd, alpha, reynolds))
+    assert np.array_equal(polar.covered(alpha, reynolds, bracket), polar.covered(alpha, reynolds))
@@ -0,0 +1,75 @@
+import pytest
+
+
+@pytest.fixture
+def designs(cherokee, monkeypatch):
+    
+    # count the real designs so a cache hit shows up as no new call
+    calls  = []
+    design = cherokee.propeller_design
+    
+    def counted(prop):
+        calls.append(prop.design_Cl)
+        return design(prop)
+    
+    monkeypatch.setattr(cherokee, 'propeller_design', counted)
+    
+    return calls
+
+
+def new_prop(cherokee, design_Cl=0.6):
+    
+    engine = cherokee.Data(sea_level_power = 180. * cherokee.Units.horsepower)
+    prop   = cherokee.prop_setup(engine)
+    prop.design_Cl = design_Cl
+    
+    return prop
+
+
+def test_same_inputs_hit_the_cache(cherokee, designs, tmp_path):
+    
+    first  = cherokee.cached_propeller_design(new_prop(cherokee), folder=str(tmp_path))
+    second = cherokee.cached_propeller_design(new_prop(cherokee), folder=str(tmp_path))
+    
+    assert len(designs) == 1
+    assert second.twist_distribution == pytest.approx(first.twist_distribution)
+    assert len(list(tmp_path.glob('propeller_*.pkl'))) == 1
+
+
+def test_changed_input_misses_the_cache(cherokee, designs, tmp_path):
+    
+    cherokee.cached_propeller_design(new_prop(cherokee, 0.6), folder=str(tmp_path))
+    cherokee.cached_propeller_design(new_prop(cherokee, 0.5), folder=str(tmp_path))
+    
+    assert designs == [0.6, 0.5]
+    assert len(list(tmp_path.glob('propeller_*.pkl'))) == 2
+
+
+def test_corrupt_cache_file_is_redesigned(cherokee, designs, tmp_path):
+    
+    cherokee.cached_propeller_design(new_prop(cherokee), folder=str(tmp_path))
+    path, = tmp_path.glob('propeller_*.pkl')
+    
+    # a run killed halfway through the write leaves a truncated pickle behind
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+    
+    prop = cherokee.cached_propeller_design(new_prop(cherokee), folder=str(tmp_path))
+    
+    assert len(designs) == 2
+    assert prop.chord_distribution is not None
+    with open(path, 'rb') as f:
+        assert cherokee.pickle.load(f).twist_distribution == pytest.approx(prop.twist_distribution)
+
+
+def test_hash_fields_cannot_run_together(cherokee):
+    
+    def digest(*values):
+        h = cherokee.hashlib.sha256()
+        for value in values:
+            cherokee.hash_update(h, value)
+        return h.hexdigest()
+    
+    assert digest('ab', 'c') != digest('a', 'bc')
+    assert digest(None, 'x') != digest('None', 'x')
+    assert digest(2) == digest(2.0)
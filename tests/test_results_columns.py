@@ -0,0 +1,37 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+def test_npy_columns_round_trip(cherokee, tmp_path):
+    
+    path    = str(tmp_path / 'run_0')
+    columns = {'propulsion.throttle' : np.linspace(0.6, 0.8, 16),
+               'segment'             : np.repeat([0, 1], 8)}
+    
+    assert cherokee.write_columns(path, columns) == path
+    assert sorted(cherokee.list_results_columns(path)) == sorted(columns)
+    
+    # one column comes back on its own as a memory map, nothing else is read
+    throttle = cherokee.load_results_column(path, 'propulsion.throttle')
+    assert isinstance(throttle, np.memmap)
+    assert np.array_equal(throttle, columns['propulsion.throttle'])
+    assert np.array_equal(cherokee.load_results_column(path, 'segment'), columns['segment'])
+
+
+def test_mission_results_flatten_to_columns(cherokee, model, tmp_path):
+    
+    vehicle, analyses = model
+    results = cherokee.mission_setup(analyses, vehicle).evaluate()
+    path    = cherokee.export_results(results, str(tmp_path / 'run_0'))
+    
+    throttle = cherokee.load_results_column(path, 'propulsion.throttle')
+    expected = np.concatenate([segment.state.conditions.propulsion.throttle[:,0] for segment in results.segments.values()])
+    assert np.array_equal(throttle, expected)
+    assert len(cherokee.load_results_column(path, 'segment')) == len(expected)
+
+
+def test_results_format_follows_the_extension(cherokee):
+    
+    assert cherokee.results_format('run_0') == 'npy'
+    assert cherokee.results_format('run_0.parquet') == 'parquet'
@@ -0,0 +1,33 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+def test_lean_results_keep_the_whitelisted_channels(cherokee, model):
+    
+    vehicle, analyses = model
+    full    = cherokee.mission_setup(analyses, vehicle).evaluate()
+    mission = cherokee.mission_setup(analyses, vehicle)
+    cherokee.Results_Retention().attach(mission)
+    lean    = mission.evaluate()
+    
+    for name in cherokee.cruise_channels:
+        assert np.array_equal(cherokee.results_channel(lean, name), cherokee.results_channel(full, name)), name
+    
+    # everything off the whitelist is down to its last row
+    assert cherokee.retained_bytes(lean) < cherokee.retained_bytes(full) / 2
+
+
+def test_lean_sweep_row_matches_a_full_solve(cherokee, model, tmp_path):
+    
+    vehicle, analyses = model
+    cherokee.init_sweep_worker(str(tmp_path / 'snapshot.pkl'))
+    index, case, row = cherokee.run_sweep_case(0, {})
+    
+    results = cherokee.mission_setup(analyses, vehicle).evaluate()
+    summary = cherokee.mission_summary(results)
+    
+    assert row.converged and summary.converged
+    for key in summary.keys():
+        assert row[key] == pytest.approx(summary[key], rel=1e-12), key
+    assert row.retained_bytes < cherokee.retained_bytes(results)
@@ -0,0 +1,133 @@
+import json
+import asyncio
+
+import pytest
+
+
+def request(cherokee, raw, solve=None):
+    
+    # the HTTP handling only, the solve is stubbed so no pool is started
+    service = cherokee.Mission_Service()
+    if solve is not None:
+        service.solve = solve
+    
+    async def run():
+        server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+        port   = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(raw)
+            await writer.drain()
+            
+            # done sending, a short body then reads as a client that hung up mid request
+            writer.write_eof()
+            response = await reader.read()
+            writer.close()
+        return response
+    
+    head, _, body = asyncio.run(run()).partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+
+def post(path, body):
+    return ('POST %s HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % (path, len(body))).encode() + body
+
+
+def test_non_object_body_is_a_bad_request(cherokee):
+    
+    status, payload = request(cherokee, post('/cruise', b'[1,2]'))
+    assert status == 400
+
+
+def test_query_is_passed_to_the_solver(cherokee):
+    
+    async def solve(query):
+        return dict(query, fuel_burn=1.)
+    
+    status, payload = request(cherokee, post('/cruise', b'{"altitude": 8000}'), solve)
+    assert status == 200
+    assert payload == {'altitude': 8000, 'fuel_burn': 1.}
+
+
+def test_coalesced_requests_are_not_labelled_cached(cherokee):
+    
+    # two identical queries while the first is still in flight, the second waits on the same future
+    service = cherokee.Mission_Service()
+    
+    async def run():
+        loop   = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def run_in_executor(executor, function, values):
+            return future
+        loop.run_in_executor = run_in_executor
+        
+        first  = asyncio.ensure_future(service.solve({}))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(service.solve({}))
+        await asyncio.sleep(0)
+        future.set_result({'fuel_burn': 1.})
+        return await first, await second, await service.solve({})
+    
+    first, second, third = asyncio.run(run())
+    assert (first['cached'], first['coalesced'])   == (False, False)
+    assert (second['cached'], second['coalesced']) == (False, True)
+    assert (third['cached'], third['coalesced'])   == (True, False)
+
+
+def test_get_query_is_url_decoded(cherokee):
+    
+    async def solve(query):
+        return query
+    
+    raw = b'GET /cruise?altitude=8000&air%5Fspeed=110+ HTTP/1.1\r\n\r\n'
+    status, payload = request(cherokee, raw, solve)
+    assert status == 200
+    assert payload == {'altitude': '8000', 'air_speed': '110 '}
+
+
+def test_oversized_body_is_refused_unread(cherokee):
+    
+    raw = b'POST /cruise HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n{}'
+    status, payload = request(cherokee, raw)
+    assert status == 413
+
+
+def test_truncated_body_is_a_bad_request(cherokee):
+    
+    raw = b'POST /cruise HTTP/1.1\r\nContent-Length: 40\r\n\r\n{"altitude": 80'
+    status, payload = request(cherokee, raw)
+    assert status == 400
+
+
+@pytest.mark.parametrize('body', [b'{"altitude": NaN}', b'{"altitude": 1e400}', b'{"air_speed": [110]}', 
+                                  b'{"distance": "far"}'])
+def test_values_that_are_not_finite_numbers_are_bad_requests(cherokee, body):
+    
+    status, payload = request(cherokee, post('/cruise', body))
+    assert status == 400
+
+
+def test_answer_is_cached_when_the_client_went_away(cherokee):
+    
+    service = cherokee.Mission_Service()
+    
+    async def run():
+        loop   = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def run_in_executor(executor, function, values):
+            return future
+        loop.run_in_executor = run_in_executor
+        
+        # the only client waiting on the solve disconnects before it finishes
+        waiting = asyncio.ensure_future(service.solve({}))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        future.set_result({'fuel_burn': 1.})
+        await asyncio.sleep(0)
+        return await service.solve({})
+    
+    answer = asyncio.run(run())
+    assert answer['cached']
+    assert service.in_flight == {}
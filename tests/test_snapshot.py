@@ -0,0 +1,40 @@
+import pytest
+
+
+def read_header(cherokee, path):
+    
+    with open(path, 'rb') as f:
+        return cherokee.pickle.load(f)
+
+
+def test_truncated_snapshot_is_rebuilt(cherokee, tmp_path):
+    
+    path = str(tmp_path / 'snapshot.pkl')
+    cherokee.load_vehicle_and_analyses(path)
+    
+    # a worker killed halfway through the write leaves the header and half the model
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    
+    vehicle, analyses = cherokee.load_vehicle_and_analyses(path)
+    
+    assert vehicle.tag == cherokee.plane_name
+    assert cherokee.load_snapshot(path)[0].mass_properties.takeoff == pytest.approx(vehicle.mass_properties.takeoff)
+
+
+def test_stale_fingerprint_is_rebuilt(cherokee, tmp_path, monkeypatch):
+    
+    path = str(tmp_path / 'snapshot.pkl')
+    cherokee.load_vehicle_and_analyses(path)
+    
+    # the build functions changed since the snapshot was written
+    monkeypatch.setattr(cherokee, 'build_fingerprint', lambda: 'edited')
+    with pytest.raises(ValueError):
+        cherokee.load_snapshot(path)
+    
+    cherokee.load_vehicle_and_analyses(path)
+    
+    assert read_header(cherokee, path)['build_fingerprint'] == 'edited'
+    cherokee.load_snapshot(path)
@@ -0,0 +1,23 @@
+import pytest
+
+
+def test_tracer_counts_each_evaluation_once(cherokee, model):
+    
+    vehicle, analyses = model
+    mission = cherokee.mission_setup(analyses, vehicle, number_control_points=4)
+    tracer  = cherokee.Solver_Tracer(record_unknowns=False)
+    
+    # a second attach must not wrap the process again
+    tracer.attach(mission)
+    tracer.attach(mission)
+    mission.evaluate()
+    
+    summary = tracer.summary()
+    for tag, segment in summary['segments'].items():
+        numbers = [record['evaluation'] for record in tracer.evaluations if record['segment'] == tag]
+        assert numbers == list(range(len(numbers)))
+        assert segment['evaluations'] == len(numbers) == tracer.counts[tag]
+    
+    # a double wrap would log every root find twice and nest one evaluation record inside another
+    assert len(tracer.solves) == len(mission.segments)
+    assert all(record['steps'] for record in tracer.evaluations)
@@ -0,0 +1,28 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+def test_sweep_fans_out_and_fills_the_store(cherokee, tmp_path):
+    
+    Units = cherokee.Units
+    grid  = {'takeoff_weight'             : [2200. * Units.lb, 2400. * Units.lb],
+             'drag_coefficient_increment' : [0.0, 0.002]}
+    
+    store   = cherokee.run_sweep(grid, max_workers=2, snapshot_path=str(tmp_path / 'snapshot.pkl'))
+    columns = store.arrays()
+    
+    # every case comes back once, in whatever order the workers finished
+    assert store.rows == 4
+    assert sorted(columns['case']) == [0, 1, 2, 3]
+    assert np.all(columns['converged'])
+    
+    order     = np.argsort(columns['case'])
+    fuel_burn = columns['fuel_burn'][order]
+    cases     = cherokee.sweep_cases(grid)
+    
+    # heavier and draggier both burn more fuel over the same mission
+    for i, case in enumerate(cases):
+        assert columns['takeoff_weight'][order][i] == pytest.approx(case['takeoff_weight'])
+    assert fuel_burn[2] > fuel_burn[0]
+    assert fuel_burn[1] > fuel_burn[0]